@@ -410,10 +410,28 @@ from datetime import datetime
 import requests
 import logging
 import os
-import boto3
+import sys
+import csv
 import json
-from datetime import datetime
+from datetime import datetime, date, timedelta
 import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlencode
+from requests.adapters import HTTPAdapter
+
+# --------------------------------------------------
+# FIX IMPORT PATH (standalone execution)
+# --------------------------------------------------
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from Ingestion.response_cache import open_cache, cache_key, get_cached, put_cached
+from Ingestion.request_scheduler import RequestScheduler
+from Ingestion.bronze_writer import BronzeBatchWriter
+from storage.backends import get_backend
+from storage.serialization import dumps
+from config import settings
 
 
 """
@@ -422,6 +440,24 @@ Bronze Layer - Weather API Ingestion
 Calls Open-Meteo API,
 adds metadata,
 and stores immutable raw JSON into S3.
+
+Supports a single default location or a list of
+locations fetched concurrently over pooled keep-alive
+HTTP connections, optionally coalesced into
+multi-coordinate API calls.
+
+Historical gaps can be backfilled from the archive
+endpoint in resumable, date-range chunks.
+
+current_weather responses are cached on disk per
+location and model time bucket, so repeat runs inside
+one bucket skip the API call and the Bronze write.
+
+All API calls in a run go through one rate-limit-aware
+scheduler (token bucket, Retry-After, backoff, budget).
+
+Multi-location runs write Bronze as compressed,
+time-partitioned NDJSON batches (see bronze_writer.py).
 """
 
 
@@ -448,45 +484,172 @@ logging.basicConfig(
 
 API_URL = "https://api.open-meteo.com/v1/forecast"
 
-PARAMS = {
-    "latitude": 12.97,
-    "longitude": 77.59,
-    "current_weather": True
-}
+
+def forecast_params(latitude, longitude):
+
+    # hourly/daily arrays are requested only for configured variables
+    params = {
+        "latitude": latitude,
+        "longitude": longitude,
+        "current_weather": True,
+        "timezone": "GMT"
+    }
+
+    if settings.HOURLY_VARIABLES:
+        params["hourly"] = ",".join(settings.HOURLY_VARIABLES)
+
+    if settings.DAILY_VARIABLES:
+        params["daily"] = ",".join(settings.DAILY_VARIABLES)
+
+    return params
+
+
+PARAMS = forecast_params(12.97, 77.59)
+
+REQUEST_TIMEOUT = 10
+
+# Bounded worker pool for multi-location runs
+MAX_WORKERS = 16
+
+# Request coalescing limits (Open-Meteo accepts comma-separated
+# latitude/longitude lists; keep URLs well under common proxy limits)
+MAX_COORDINATES_PER_CALL = 100
+MAX_URL_LENGTH = 4000
+
+# Historical backfill (archive endpoint, hourly history)
+ARCHIVE_URL = "https://archive-api.open-meteo.com/v1/archive"
+
+HISTORY_HOURLY_VARIABLES = settings.HOURLY_VARIABLES
+
+BACKFILL_CHUNK_DAYS = 31
+BACKFILL_MAX_WORKERS = 8
+
+# On-disk response cache (see Ingestion/response_cache.py)
+USE_RESPONSE_CACHE = True
+
+
+# ============================================================
+# LOCATIONS
+# ============================================================
+
+def location_id_for(latitude, longitude):
+
+    return f"{float(latitude):.4f}_{float(longitude):.4f}"
+
+
+def normalize_location(raw_location):
+
+    latitude = float(raw_location["latitude"])
+    longitude = float(raw_location["longitude"])
+
+    location_id = raw_location.get("location_id") or raw_location.get("name")
+
+    return {
+        "location_id": str(location_id or location_id_for(latitude, longitude)),
+        "latitude": latitude,
+        "longitude": longitude
+    }
+
+
+def load_locations(locations_file):
+
+    """
+    Reads a location list from a JSON file (list of objects)
+    or a CSV file with latitude/longitude columns
+    and an optional location_id or name column.
+    """
+
+    if locations_file.lower().endswith(".csv"):
+        with open(locations_file, newline="") as f:
+            raw_locations = list(csv.DictReader(f))
+    else:
+        with open(locations_file) as f:
+            raw_locations = json.load(f)
+
+    locations = [normalize_location(loc) for loc in raw_locations]
+
+    logging.info(f"Loaded {len(locations)} locations from {locations_file}")
+
+    return locations
+
+
+# ============================================================
+# HTTP SESSION (POOLED KEEP-ALIVE CONNECTIONS)
+# ============================================================
+
+def create_http_session(pool_size=MAX_WORKERS):
+
+    session = requests.Session()
+
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size
+    )
+
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    return session
 
 
 # ============================================================
 # INGEST DATA FROM API
 # ============================================================
 
-def ingest_weather_data():
+def request_weather(params, session=None, url=API_URL, scheduler=None):
+
+    http = session or requests
+
+    if scheduler is not None:
+        response = scheduler.get(http, url, params=params, timeout=REQUEST_TIMEOUT)
+    else:
+        response = http.get(url, params=params, timeout=REQUEST_TIMEOUT)
+
+    if response.status_code != 200:
+        raise requests.exceptions.HTTPError(
+            f"API call failed: {response.status_code}",
+            response=response
+        )
+
+    return response.json()
+
+
+def build_enriched_data(data, location_id):
+
+    return {
+        "metadata": {
+            "ingestion_timestamp": datetime.utcnow().isoformat(),
+            "source_system": "open-meteo",
+            "run_id": str(uuid.uuid4()),
+            "location_id": location_id
+        },
+        "payload": data
+    }
+
+
+def ingest_weather_data(params=None, session=None, location_id=None, scheduler=None):
+
+    params = params or PARAMS
+    location_id = location_id or location_id_for(
+        params["latitude"], params["longitude"]
+    )
 
     logging.info("Ingestion started")
 
     try:
         logging.info("Calling weather API")
 
-        response = requests.get(API_URL, params=PARAMS, timeout=10)
-
-        if response.status_code != 200:
-            logging.error(f"API call failed: {response.status_code}")
-            return None
+        data = request_weather(params, session, scheduler=scheduler)
 
-        data = response.json()
-
-        enriched_data = {
-            "metadata": {
-                "ingestion_timestamp": datetime.utcnow().isoformat(),
-                "source_system": "open-meteo",
-                "run_id": str(uuid.uuid4())
-            },
-            "payload": data
-        }
+        enriched_data = build_enriched_data(data, location_id)
 
         logging.info("Metadata added successfully")
 
         return enriched_data
 
+    except requests.exceptions.HTTPError as e:
+        logging.error(str(e))
+
     except requests.exceptions.Timeout:
         logging.error("API request timed out")
 
@@ -502,6 +665,238 @@ def ingest_weather_data():
     return None
 
 
+# ============================================================
+# MULTI-LOCATION INGESTION (CONCURRENT)
+# ============================================================
+
+def fetch_location(session, location, scheduler=None):
+
+    params = forecast_params(location["latitude"], location["longitude"])
+
+    try:
+        data = request_weather(params, session, scheduler=scheduler)
+
+    except (requests.exceptions.RequestException, ValueError) as e:
+        return {
+            "location_id": location["location_id"],
+            "status": "failed",
+            "error": f"{type(e).__name__}: {e}",
+            "data": None
+        }
+
+    return {
+        "location_id": location["location_id"],
+        "status": "success",
+        "error": None,
+        "data": build_enriched_data(data, location["location_id"])
+    }
+
+
+def ingest_multiple_locations(locations, max_workers=MAX_WORKERS, scheduler=None):
+
+    """
+    Fetches all locations through a bounded thread pool
+    sharing one pooled session, and returns one result
+    dict per location (status, error, enriched data).
+    """
+
+    logging.info(f"Multi-location ingestion started: {len(locations)} locations")
+
+    results = []
+    workers = max(1, min(max_workers, len(locations)))
+
+    with create_http_session(pool_size=workers) as session:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+
+            futures = [
+                executor.submit(fetch_location, session, location, scheduler)
+                for location in locations
+            ]
+
+            for future in as_completed(futures):
+                result = future.result()
+
+                if result["status"] == "success":
+                    logging.info(f"Fetched location {result['location_id']}")
+                else:
+                    logging.error(
+                        f"Failed location {result['location_id']}: {result['error']}"
+                    )
+
+                results.append(result)
+
+    succeeded = sum(1 for r in results if r["status"] == "success")
+
+    logging.info(
+        f"Multi-location ingestion finished: "
+        f"{succeeded} succeeded, {len(results) - succeeded} failed"
+    )
+
+    return results
+
+
+# ============================================================
+# REQUEST COALESCING (MULTI-COORDINATE CALLS)
+# ============================================================
+
+def format_coordinate(value):
+
+    return f"{float(value):.4f}".rstrip("0").rstrip(".")
+
+
+def build_batch_params(batch):
+
+    return forecast_params(
+        ",".join(format_coordinate(loc["latitude"]) for loc in batch),
+        ",".join(format_coordinate(loc["longitude"]) for loc in batch)
+    )
+
+
+def plan_coordinate_batches(locations,
+                            max_per_call=MAX_COORDINATES_PER_CALL,
+                            max_url_length=MAX_URL_LENGTH):
+
+    """
+    Packs locations into as few calls as possible while
+    keeping each call under the coordinate count and
+    encoded URL length limits.
+    """
+
+    # Length of the URL with empty coordinate lists;
+    # each extra coordinate pair adds its digits plus
+    # two encoded commas ("%2C").
+    base_length = len(
+        f"{API_URL}?" + urlencode(forecast_params("", ""))
+    )
+    separator_length = 2 * len("%2C")
+
+    batches = []
+    current = []
+    current_length = base_length
+
+    for location in locations:
+
+        pair_length = (
+            len(format_coordinate(location["latitude"]))
+            + len(format_coordinate(location["longitude"]))
+        )
+        added_length = pair_length + (separator_length if current else 0)
+
+        if current and (
+            len(current) >= max_per_call
+            or current_length + added_length > max_url_length
+        ):
+            batches.append(current)
+            current = []
+            current_length = base_length
+            added_length = pair_length
+
+        current.append(location)
+        current_length += added_length
+
+    if current:
+        batches.append(current)
+
+    logging.info(f"Planned {len(batches)} API calls for {len(locations)} locations")
+
+    return batches
+
+
+def split_batch_response(data, batch):
+
+    """
+    Splits a combined API response back into one enriched
+    envelope per location. Open-Meteo returns a list in
+    request order for multiple coordinates and a single
+    object for one coordinate.
+    """
+
+    if isinstance(data, dict):
+        data = [data]
+
+    if len(data) != len(batch):
+        raise ValueError(
+            f"Expected {len(batch)} locations in response, got {len(data)}"
+        )
+
+    return [
+        build_enriched_data(location_data, location["location_id"])
+        for location_data, location in zip(data, batch)
+    ]
+
+
+def fetch_coordinate_batch(session, batch, scheduler=None):
+
+    try:
+        data = request_weather(build_batch_params(batch), session, scheduler=scheduler)
+        envelopes = split_batch_response(data, batch)
+
+    except (requests.exceptions.RequestException, ValueError) as e:
+        error = f"{type(e).__name__}: {e}"
+        return [
+            {
+                "location_id": location["location_id"],
+                "status": "failed",
+                "error": error,
+                "data": None
+            }
+            for location in batch
+        ]
+
+    return [
+        {
+            "location_id": location["location_id"],
+            "status": "success",
+            "error": None,
+            "data": envelope
+        }
+        for location, envelope in zip(batch, envelopes)
+    ]
+
+
+def ingest_coalesced_locations(locations, max_workers=MAX_WORKERS, scheduler=None):
+
+    """
+    Same result shape as ingest_multiple_locations, but
+    fetches planned coordinate batches instead of one
+    request per location.
+    """
+
+    batches = plan_coordinate_batches(locations)
+
+    results = []
+    workers = max(1, min(max_workers, len(batches)))
+
+    with create_http_session(pool_size=workers) as session:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+
+            futures = [
+                executor.submit(fetch_coordinate_batch, session, batch, scheduler)
+                for batch in batches
+            ]
+
+            for future in as_completed(futures):
+                batch_results = future.result()
+
+                failed = [r for r in batch_results if r["status"] != "success"]
+                if failed:
+                    logging.error(
+                        f"Batch of {len(batch_results)} locations failed: "
+                        f"{failed[0]['error']}"
+                    )
+
+                results.extend(batch_results)
+
+    succeeded = sum(1 for r in results if r["status"] == "success")
+
+    logging.info(
+        f"Coalesced ingestion finished: "
+        f"{succeeded} succeeded, {len(results) - succeeded} failed"
+    )
+
+    return results
+
+
 # ============================================================
 # STORE RAW DATA IN S3 (BRONZE)
 # ============================================================
@@ -512,38 +907,354 @@ def store_raw_data_s3(enriched_data):
         logging.warning("No data to upload")
         return
 
-    s3 = boto3.client("s3")
+    storage = get_backend()
 
     run_id = enriched_data["metadata"]["run_id"]
-    file_name = f"{run_id}.json"
+    now = datetime.utcnow()
+
+    # Time-partitioned so transformation can list only new days
+    key = (
+        f"{settings.RAW_PREFIX}/"
+        f"year={now:%Y}/month={now:%m}/day={now:%d}/hour={now:%H}/"
+        f"{run_id}.json"
+    )
+
+    storage.put_bytes(
+        settings.RAW_BUCKET,
+        key,
+        dumps(enriched_data),
+        content_type="application/json"
+    )
+
+    logging.info(f"Uploaded raw file: {key}")
+
+
+# ============================================================
+# HISTORICAL BACKFILL (ARCHIVE ENDPOINT)
+# ============================================================
+
+def to_date(value):
+
+    if isinstance(value, date):
+        return value
+
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def split_date_range(start_date, end_date, chunk_days=BACKFILL_CHUNK_DAYS):
+
+    """
+    Splits an inclusive date range into consecutive
+    inclusive (start, end) chunks of at most chunk_days.
+    """
+
+    start_date = to_date(start_date)
+    end_date = to_date(end_date)
+
+    chunks = []
+    chunk_start = start_date
+
+    while chunk_start <= end_date:
+        chunk_end = min(chunk_start + timedelta(days=chunk_days - 1), end_date)
+        chunks.append((chunk_start, chunk_end))
+        chunk_start = chunk_end + timedelta(days=1)
+
+    return chunks
+
+
+def history_object_key(location_id, chunk_start, chunk_end):
+
+    # Deterministic key per (location, chunk) so a rerun
+    # can skip chunks that already landed in Bronze.
+    return (
+        f"{settings.RAW_HISTORY_PREFIX}/"
+        f"location={location_id}/"
+        f"{chunk_start.isoformat()}_{chunk_end.isoformat()}.json"
+    )
+
+
+def backfill_chunk(session, storage, location, chunk_start, chunk_end, scheduler=None):
+
+    key = history_object_key(location["location_id"], chunk_start, chunk_end)
+
+    result = {
+        "location_id": location["location_id"],
+        "start_date": chunk_start.isoformat(),
+        "end_date": chunk_end.isoformat(),
+        "key": key,
+        "status": "success",
+        "error": None,
+        "size": None
+    }
+
+    # Listing the exact key also returns its size for the marker
+    existing = next(iter(storage.list_objects(settings.RAW_BUCKET, key)), None)
+
+    if existing is not None and existing["key"] == key:
+        result["status"] = "skipped"
+        result["size"] = existing["size"]
+        return result
+
+    params = {
+        "latitude": location["latitude"],
+        "longitude": location["longitude"],
+        "start_date": chunk_start.isoformat(),
+        "end_date": chunk_end.isoformat(),
+        "hourly": ",".join(HISTORY_HOURLY_VARIABLES),
+        "timezone": "GMT"
+    }
+
+    try:
+        data = request_weather(params, session, url=ARCHIVE_URL, scheduler=scheduler)
+
+    except (requests.exceptions.RequestException, ValueError) as e:
+        result["status"] = "failed"
+        result["error"] = f"{type(e).__name__}: {e}"
+        return result
+
+    enriched_data = build_enriched_data(data, location["location_id"])
+    enriched_data["metadata"]["backfill_start"] = chunk_start.isoformat()
+    enriched_data["metadata"]["backfill_end"] = chunk_end.isoformat()
+
+    body = dumps(enriched_data)
 
-    s3.put_object(
-        Bucket="weather-data-raw-bhanu",
-        Key=f"raw/weather/{file_name}",
-        Body=json.dumps(enriched_data),
-        ContentType="application/json"
+    storage.put_bytes(
+        settings.RAW_BUCKET,
+        key,
+        body,
+        content_type="application/json"
     )
 
-    logging.info(f"Uploaded raw file: raw/weather/{file_name}")
+    result["size"] = len(body)
+
+    return result
+
+
+def write_history_marker(storage, results):
+
+    """
+    Leaves one pending marker listing every chunk of this run
+    that is in Bronze (new or skipped), so the history
+    transformation reads the marker instead of listing the
+    whole history prefix. Skipped chunks are included in case
+    an earlier run stopped before writing its marker.
+    """
+
+    objects = [
+        {"key": result["key"], "size": result["size"]}
+        for result in results
+        if result["status"] != "failed"
+    ]
+
+    if not objects:
+        return None
+
+    marker_key = (
+        f"{settings.HISTORY_PENDING_PREFIX}/"
+        f"{datetime.utcnow():%Y%m%dT%H%M%S}_{uuid.uuid4().hex[:8]}.json"
+    )
+
+    storage.put_bytes(
+        settings.RAW_BUCKET,
+        marker_key,
+        dumps({"objects": objects}),
+        content_type="application/json"
+    )
+
+    return marker_key
 
 
 # ============================================================
 # PIPELINE RUNNER (USED BY ORCHESTRATOR)
 # ============================================================
 
-def run_ingestion():
+def run_ingestion(use_cache=USE_RESPONSE_CACHE):
 
     logging.info("===== INGESTION STEP STARTED =====")
 
-    result = ingest_weather_data()
-    store_raw_data_s3(result)
+    cache = open_cache() if use_cache else None
+    key = cache_key(location_id_for(PARAMS["latitude"], PARAMS["longitude"]))
+
+    if cache is not None and get_cached(cache, key) is not None:
+        logging.info(f"Cache hit for {key}, skipping API call and Bronze write")
+
+    else:
+        result = ingest_weather_data(scheduler=RequestScheduler())
+        store_raw_data_s3(result)
+
+        if cache is not None and result is not None:
+            put_cached(cache, key, result["payload"])
+
+    if cache is not None:
+        cache.close()
 
     logging.info("===== INGESTION STEP COMPLETED =====")
 
 
+def run_multi_location_ingestion(locations=None, locations_file=None,
+                                 max_workers=MAX_WORKERS, coalesce=False,
+                                 use_cache=USE_RESPONSE_CACHE):
+
+    logging.info("===== MULTI-LOCATION INGESTION STEP STARTED =====")
+
+    if locations is None:
+        locations = load_locations(locations_file)
+    else:
+        locations = [normalize_location(loc) for loc in locations]
+
+    # ---------------------------------
+    # Cache lookup (hits skip API + Bronze)
+    # ---------------------------------
+    cache = open_cache() if use_cache else None
+    keys = {loc["location_id"]: cache_key(loc["location_id"]) for loc in locations}
+
+    cached_results = []
+
+    if cache is not None:
+        to_fetch = []
+
+        for location in locations:
+            if get_cached(cache, keys[location["location_id"]]) is None:
+                to_fetch.append(location)
+            else:
+                cached_results.append({
+                    "location_id": location["location_id"],
+                    "status": "cached",
+                    "error": None,
+                    "data": None
+                })
+
+        logging.info(f"Cache hits: {len(cached_results)}, to fetch: {len(to_fetch)}")
+        locations = to_fetch
+
+    # ---------------------------------
+    # Fetch + store
+    # ---------------------------------
+    scheduler = RequestScheduler()
+
+    if not locations:
+        results = []
+    elif coalesce:
+        results = ingest_coalesced_locations(
+            locations, max_workers=max_workers, scheduler=scheduler
+        )
+    else:
+        results = ingest_multiple_locations(
+            locations, max_workers=max_workers, scheduler=scheduler
+        )
+
+    logging.info(f"Request scheduler stats: {scheduler.stats}")
+
+    with BronzeBatchWriter() as writer:
+        for result in results:
+            if result["status"] == "success":
+                writer.add(result["data"])
+
+    logging.info(f"Bronze batches written: {len(writer.written_keys)}")
+
+    # Only after the batches are uploaded: a failed upload must
+    # not leave the cache claiming this window was ingested
+    if cache is not None:
+        for result in results:
+            if result["status"] == "success":
+                put_cached(cache, keys[result["location_id"]], result["data"]["payload"])
+
+    if cache is not None:
+        cache.close()
+
+    results = cached_results + results
+
+    logging.info("===== MULTI-LOCATION INGESTION STEP COMPLETED =====")
+
+    return results
+
+
+def run_backfill(start_date, end_date, locations=None, locations_file=None,
+                 chunk_days=BACKFILL_CHUNK_DAYS, max_workers=BACKFILL_MAX_WORKERS):
+
+    """
+    Pulls hourly history for every location over the given
+    date range. The range is split into chunks that run in
+    parallel; each chunk is its own Bronze object, so a
+    rerun only fetches chunks that are still missing.
+    """
+
+    logging.info("===== BACKFILL STEP STARTED =====")
+
+    if locations is None:
+        locations = load_locations(locations_file)
+    else:
+        locations = [normalize_location(loc) for loc in locations]
+
+    chunks = split_date_range(start_date, end_date, chunk_days)
+
+    tasks = [
+        (location, chunk_start, chunk_end)
+        for location in locations
+        for chunk_start, chunk_end in chunks
+    ]
+
+    logging.info(
+        f"Backfill planned: {len(locations)} locations x "
+        f"{len(chunks)} chunks = {len(tasks)} tasks"
+    )
+
+    results = []
+    workers = max(1, min(max_workers, len(tasks)))
+
+    # Shared, thread-safe storage backend for all workers
+    storage = get_backend()
+    scheduler = RequestScheduler()
+
+    with create_http_session(pool_size=workers) as session:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+
+            futures = [
+                executor.submit(backfill_chunk, session, storage, *task, scheduler)
+                for task in tasks
+            ]
+
+            for future in as_completed(futures):
+                result = future.result()
+
+                if result["status"] == "failed":
+                    logging.error(
+                        f"Backfill chunk failed {result['key']}: {result['error']}"
+                    )
+                else:
+                    logging.info(f"Backfill chunk {result['status']}: {result['key']}")
+
+                results.append(result)
+
+    counts = {}
+    for result in results:
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+
+    marker_key = write_history_marker(storage, results)
+
+    logging.info(f"Backfill summary: {counts}")
+    logging.info(f"History pending marker: {marker_key}")
+    logging.info(f"Request scheduler stats: {scheduler.stats}")
+    logging.info("===== BACKFILL STEP COMPLETED =====")
+
+    return results
+
+
 # ============================================================
 # ENTRY POINT (Standalone Execution)
 # ============================================================
 
+# Usage:
+#   python Ingestion/Ingestion.py                    -> default location
+#   python Ingestion/Ingestion.py locations.json     -> location list
+#   python Ingestion/Ingestion.py locations.json 2025-01-01 2025-12-31
+#                                                    -> historical backfill
+
 if __name__ == "__main__":
-    run_ingestion()
+
+    if len(sys.argv) > 3:
+        run_backfill(sys.argv[2], sys.argv[3], locations_file=sys.argv[1])
+    elif len(sys.argv) > 1:
+        run_multi_location_ingestion(locations_file=sys.argv[1])
+    else:
+        run_ingestion()
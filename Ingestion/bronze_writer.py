@@ -0,0 +1,188 @@
+# ============================================================
+# IMPORTS
+# ============================================================
+
+import time
+import uuid
+import zlib
+import logging
+import tempfile
+import threading
+from datetime import datetime
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from storage.backends import get_backend
+from storage.serialization import dumps
+from config import settings
+
+
+"""
+Bronze Batch Writer
+
+Buffers many enriched envelopes into one compressed NDJSON
+object (gzip by default, zstd when the zstandard package is
+installed) instead of one small JSON object per record.
+
+- one envelope per line, so per-record metadata
+  (run_id, ingestion_timestamp, location_id) is kept as-is
+- flushes when the compressed batch reaches max_bytes or the
+  oldest buffered record reaches max_age_seconds, and on close
+- large batches go up as S3 multipart uploads
+  (handled by the storage backend)
+- keys are partitioned by ingestion time:
+  raw/weather/year=YYYY/month=MM/day=DD/hour=HH/batch_<uuid>.ndjson.gz
+"""
+
+
+# ============================================================
+# WRITER CONFIG
+# ============================================================
+
+MAX_BATCH_BYTES = 64 * 1024 * 1024
+MAX_BATCH_AGE_SECONDS = 300
+
+# Spill the in-progress batch to disk beyond this size
+SPOOL_MEMORY_BYTES = 8 * 1024 * 1024
+
+COMPRESSION_EXTENSIONS = {"gzip": ".gz", "zstd": ".zst"}
+
+
+# ============================================================
+# BRONZE BATCH WRITER
+# ============================================================
+
+class BronzeBatchWriter:
+
+    def __init__(self, storage=None, bucket=None, prefix=None,
+                 compression="gzip", max_bytes=MAX_BATCH_BYTES,
+                 max_age_seconds=MAX_BATCH_AGE_SECONDS):
+
+        if compression == "zstd" and zstandard is None:
+            logging.warning("zstandard not installed, falling back to gzip")
+            compression = "gzip"
+
+        if compression not in COMPRESSION_EXTENSIONS:
+            raise ValueError(f"Unsupported compression: {compression}")
+
+        self.storage = storage or get_backend()
+        self.bucket = bucket or settings.RAW_BUCKET
+        self.prefix = (prefix or settings.RAW_PREFIX).rstrip("/")
+        self.compression = compression
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+
+        self.lock = threading.Lock()
+        self.written_keys = []
+        self._reset()
+
+    def _reset(self):
+
+        self.buffer = tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_BYTES)
+        self.record_count = 0
+        self.raw_bytes = 0
+        self.compressed_bytes = 0
+        self.opened_at = None
+
+        if self.compression == "zstd":
+            self.compressor = zstandard.ZstdCompressor().compressobj()
+        else:
+            # wbits=31 -> gzip container
+            self.compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+
+    def _write(self, chunk):
+
+        if chunk:
+            self.buffer.write(chunk)
+            self.compressed_bytes += len(chunk)
+
+    # ---------------------------------
+    # Public API
+    # ---------------------------------
+
+    def add(self, enriched_data):
+
+        if enriched_data is None:
+            return
+
+        line = dumps(enriched_data) + b"\n"
+
+        with self.lock:
+            if self.opened_at is None:
+                self.opened_at = time.monotonic()
+
+            self._write(self.compressor.compress(line))
+            self.record_count += 1
+            self.raw_bytes += len(line)
+
+            if self._should_flush():
+                self._flush()
+
+    def flush(self):
+
+        with self.lock:
+            self._flush()
+
+    def close(self):
+
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # ---------------------------------
+    # Internals
+    # ---------------------------------
+
+    def _should_flush(self):
+
+        # compressed_bytes trails the true size by whatever the
+        # compressor still holds internally (a few deflate blocks),
+        # which is negligible against a multi-MB threshold
+        return (
+            self.compressed_bytes >= self.max_bytes
+            or time.monotonic() - self.opened_at >= self.max_age_seconds
+        )
+
+    def _object_key(self):
+
+        now = datetime.utcnow()
+        extension = COMPRESSION_EXTENSIONS[self.compression]
+
+        return (
+            f"{self.prefix}/"
+            f"year={now:%Y}/month={now:%m}/day={now:%d}/hour={now:%H}/"
+            f"batch_{now:%Y%m%dT%H%M%S}_{uuid.uuid4().hex}.ndjson{extension}"
+        )
+
+    def _flush(self):
+
+        if self.record_count == 0:
+            return
+
+        self._write(self.compressor.flush())
+        self.buffer.seek(0)
+
+        key = self._object_key()
+
+        self.storage.upload_fileobj(
+            self.buffer,
+            self.bucket,
+            key,
+            content_type="application/x-ndjson"
+        )
+
+        logging.info(
+            f"Uploaded Bronze batch: {key} "
+            f"({self.record_count} records, {self.raw_bytes} -> {self.compressed_bytes} bytes)"
+        )
+
+        self.written_keys.append(key)
+        self.buffer.close()
+        self._reset()
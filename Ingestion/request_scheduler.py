@@ -0,0 +1,237 @@
+# ============================================================
+# IMPORTS
+# ============================================================
+
+import time
+import random
+import logging
+import threading
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+
+import requests
+
+
+"""
+Rate-Limit-Aware Request Scheduler
+
+Shared by all ingestion workers in a run:
+
+- token bucket limiter (requests per second + burst)
+- honours 429 / 503 Retry-After by pausing every worker
+- exponential backoff with full jitter for timeouts,
+  connection errors and 5xx responses
+- adaptive rate: halves on throttling, creeps back up
+  to the configured rate on success (AIMD)
+- per-run request budget
+"""
+
+
+# ============================================================
+# SCHEDULER CONFIG
+# ============================================================
+
+# Open-Meteo free tier allows 600 calls / minute
+RATE_PER_SECOND = 10.0
+BURST = 10
+
+MAX_RETRIES = 5
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 60.0
+
+REQUEST_BUDGET = 5000
+
+MIN_RATE_PER_SECOND = 0.5
+RATE_RECOVERY_STEP = 0.1
+
+THROTTLE_STATUS_CODES = {429, 503}
+RETRY_STATUS_CODES = {500, 502, 504}
+
+
+class RequestBudgetExceeded(requests.exceptions.RequestException):
+    pass
+
+
+# ============================================================
+# TOKEN BUCKET
+# ============================================================
+
+class TokenBucket:
+
+    def __init__(self, rate_per_second=RATE_PER_SECOND, burst=BURST):
+
+        self.rate = rate_per_second
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+
+        self.tokens = min(
+            self.capacity,
+            self.tokens + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
+
+    def acquire(self):
+
+        while True:
+            with self.lock:
+                now = time.monotonic()
+
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                else:
+                    self._refill(now)
+
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+
+                    wait = (1 - self.tokens) / self.rate
+
+            time.sleep(wait)
+
+    def pause(self, seconds):
+
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+
+    def set_rate(self, rate_per_second):
+
+        with self.lock:
+            self._refill(time.monotonic())
+            self.rate = rate_per_second
+
+
+# ============================================================
+# REQUEST SCHEDULER
+# ============================================================
+
+def parse_retry_after(value):
+
+    """
+    Retry-After is either delta-seconds or an HTTP date.
+    Returns seconds to wait, or None if missing/unparseable.
+    """
+
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt, base=BACKOFF_BASE_SECONDS, cap=BACKOFF_MAX_SECONDS):
+
+    # Exponential backoff with full jitter
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class RequestScheduler:
+
+    def __init__(self, rate_per_second=RATE_PER_SECOND, burst=BURST,
+                 max_retries=MAX_RETRIES, request_budget=REQUEST_BUDGET):
+
+        self.target_rate = rate_per_second
+        self.bucket = TokenBucket(rate_per_second, burst)
+        self.max_retries = max_retries
+        self.remaining_budget = request_budget
+        self.lock = threading.Lock()
+
+        self.stats = {"requests": 0, "throttled": 0, "retried": 0}
+
+    def _spend_budget(self):
+
+        with self.lock:
+            if self.remaining_budget is not None:
+                if self.remaining_budget <= 0:
+                    raise RequestBudgetExceeded("Per-run request budget exhausted")
+                self.remaining_budget -= 1
+
+            self.stats["requests"] += 1
+
+    def _on_throttled(self, retry_after):
+
+        with self.lock:
+            self.stats["throttled"] += 1
+            new_rate = max(MIN_RATE_PER_SECOND, self.bucket.rate / 2)
+
+        self.bucket.set_rate(new_rate)
+        self.bucket.pause(retry_after)
+
+        logging.warning(
+            f"Throttled by API: pausing {retry_after:.1f}s, "
+            f"rate lowered to {new_rate:.2f} req/s"
+        )
+
+    def _on_success(self):
+
+        if self.bucket.rate < self.target_rate:
+            self.bucket.set_rate(
+                min(self.target_rate, self.bucket.rate + RATE_RECOVERY_STEP)
+            )
+
+    def get(self, session, url, params=None, timeout=10):
+
+        """
+        Sends a GET through the limiter, retrying throttled,
+        failed and 5xx requests. Returns the final response
+        (which may still be non-200 once retries run out).
+        """
+
+        attempt = 0
+
+        while True:
+            self._spend_budget()
+            self.bucket.acquire()
+
+            try:
+                response = session.get(url, params=params, timeout=timeout)
+
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+                if attempt >= self.max_retries:
+                    raise
+
+                self._retry_wait(attempt)
+                attempt += 1
+                continue
+
+            if response.status_code in THROTTLE_STATUS_CODES and attempt < self.max_retries:
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                self._on_throttled(
+                    retry_after if retry_after is not None else backoff_delay(attempt)
+                )
+                attempt += 1
+                continue
+
+            if response.status_code in RETRY_STATUS_CODES and attempt < self.max_retries:
+                self._retry_wait(attempt)
+                attempt += 1
+                continue
+
+            if response.status_code == 200:
+                self._on_success()
+
+            return response
+
+    def _retry_wait(self, attempt):
+
+        with self.lock:
+            self.stats["retried"] += 1
+
+        delay = backoff_delay(attempt)
+        logging.warning(f"Request failed, retrying in {delay:.1f}s (attempt {attempt + 1})")
+        time.sleep(delay)
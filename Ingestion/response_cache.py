@@ -0,0 +1,147 @@
+# ============================================================
+# IMPORTS
+# ============================================================
+
+import os
+import time
+import sqlite3
+import logging
+from datetime import datetime, timezone
+
+from storage.serialization import dumps, loads
+
+
+"""
+Weather API Response Cache
+
+Small on-disk (SQLite) cache for current_weather payloads,
+keyed by location_id and the model update time bucket.
+Open-Meteo only refreshes current_weather when the upstream
+model updates, so repeated calls inside one bucket return the
+same payload and can skip both the HTTP call and the Bronze write.
+
+Entries expire after CACHE_TTL_SECONDS and the table is trimmed
+to CACHE_MAX_ENTRIES (oldest first).
+"""
+
+
+# ============================================================
+# CACHE CONFIG
+# ============================================================
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_FILE = os.path.join(BASE_DIR, "state", "weather_cache.sqlite")
+
+MODEL_UPDATE_MINUTES = 15
+CACHE_TTL_SECONDS = MODEL_UPDATE_MINUTES * 60
+CACHE_MAX_ENTRIES = 5000
+
+
+# ============================================================
+# CACHE KEY
+# ============================================================
+
+def time_bucket(now=None, bucket_minutes=MODEL_UPDATE_MINUTES):
+
+    now = now or datetime.now(timezone.utc)
+
+    bucket_seconds = bucket_minutes * 60
+    bucket_start = int(now.timestamp()) // bucket_seconds * bucket_seconds
+
+    return datetime.fromtimestamp(bucket_start, timezone.utc).strftime("%Y-%m-%dT%H:%M")
+
+
+def cache_key(location_id, now=None):
+
+    # Same identity as the Bronze / Silver rows: two locations
+    # never share an entry unless they share a location_id
+    return f"{location_id}|{time_bucket(now)}"
+
+
+# ============================================================
+# CACHE STORE
+# ============================================================
+
+def open_cache(path=CACHE_FILE):
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    conn = sqlite3.connect(path)
+
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS responses (
+            cache_key TEXT PRIMARY KEY,
+            payload BLOB NOT NULL,
+            created_at REAL NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_responses_created ON responses (created_at)"
+    )
+    conn.commit()
+
+    return conn
+
+
+def get_cached(conn, key, ttl_seconds=CACHE_TTL_SECONDS):
+
+    row = conn.execute(
+        "SELECT payload, created_at FROM responses WHERE cache_key = ?",
+        (key,)
+    ).fetchone()
+
+    if row is None:
+        return None
+
+    payload, created_at = row
+
+    if time.time() - created_at > ttl_seconds:
+        conn.execute("DELETE FROM responses WHERE cache_key = ?", (key,))
+        conn.commit()
+        return None
+
+    return loads(payload)
+
+
+def put_cached(conn, key, payload,
+               ttl_seconds=CACHE_TTL_SECONDS, max_entries=CACHE_MAX_ENTRIES):
+
+    now = time.time()
+
+    conn.execute(
+        "INSERT OR REPLACE INTO responses (cache_key, payload, created_at) VALUES (?, ?, ?)",
+        (key, dumps(payload), now)
+    )
+
+    evict(conn, ttl_seconds, max_entries, now)
+
+    conn.commit()
+
+
+def evict(conn, ttl_seconds=CACHE_TTL_SECONDS, max_entries=CACHE_MAX_ENTRIES, now=None):
+
+    now = now or time.time()
+
+    # TTL eviction
+    expired = conn.execute(
+        "DELETE FROM responses WHERE created_at < ?",
+        (now - ttl_seconds,)
+    ).rowcount
+
+    # Size eviction (drop oldest beyond max_entries)
+    trimmed = conn.execute(
+        """
+        DELETE FROM responses
+        WHERE cache_key IN (
+            SELECT cache_key FROM responses
+            ORDER BY created_at DESC
+            LIMIT -1 OFFSET ?
+        )
+        """,
+        (max_entries,)
+    ).rowcount
+
+    if expired or trimmed:
+        logging.info(f"Cache eviction: {expired} expired, {trimmed} over size limit")
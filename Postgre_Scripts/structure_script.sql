@@ -18,3 +18,136 @@ select * from  weather_observations;
 
 
 
+
+
+-- Incremental rollups (maintained by gold_layer/rollups.py)
+
+CREATE TABLE weather_rollup_hourly (
+    location_id TEXT NOT NULL,
+    bucket_start TIMESTAMP NOT NULL,
+    temperature_count BIGINT NOT NULL DEFAULT 0,
+    temperature_sum DOUBLE PRECISION,
+    temperature_min FLOAT,
+    temperature_max FLOAT,
+    windspeed_count BIGINT NOT NULL DEFAULT 0,
+    windspeed_sum DOUBLE PRECISION,
+    windspeed_min FLOAT,
+    windspeed_max FLOAT,
+    temperature_mean DOUBLE PRECISION
+        GENERATED ALWAYS AS (temperature_sum / NULLIF(temperature_count, 0)) STORED,
+    windspeed_mean DOUBLE PRECISION
+        GENERATED ALWAYS AS (windspeed_sum / NULLIF(windspeed_count, 0)) STORED,
+    PRIMARY KEY (location_id, bucket_start)
+);
+
+CREATE TABLE weather_rollup_daily (
+    location_id TEXT NOT NULL,
+    bucket_start TIMESTAMP NOT NULL,
+    temperature_count BIGINT NOT NULL DEFAULT 0,
+    temperature_sum DOUBLE PRECISION,
+    temperature_min FLOAT,
+    temperature_max FLOAT,
+    windspeed_count BIGINT NOT NULL DEFAULT 0,
+    windspeed_sum DOUBLE PRECISION,
+    windspeed_min FLOAT,
+    windspeed_max FLOAT,
+    temperature_mean DOUBLE PRECISION
+        GENERATED ALWAYS AS (temperature_sum / NULLIF(temperature_count, 0)) STORED,
+    windspeed_mean DOUBLE PRECISION
+        GENERATED ALWAYS AS (windspeed_sum / NULLIF(windspeed_count, 0)) STORED,
+    PRIMARY KEY (location_id, bucket_start)
+);
+
+select * from weather_rollup_daily order by bucket_start desc;
+
+
+
+-- Gold key per location (gold_layer/load_to_postgre.py merge load)
+-- Several sites share observation times: key on (location_id, observation_time)
+
+ALTER TABLE weather_observations
+    ADD COLUMN location_id TEXT NOT NULL DEFAULT 'unknown';
+
+ALTER TABLE weather_observations DROP CONSTRAINT weather_observations_pkey;
+
+ALTER TABLE weather_observations ADD PRIMARY KEY (location_id, observation_time);
+
+ALTER TABLE weather_observations ALTER COLUMN location_id DROP DEFAULT;
+
+
+
+-- Partitioned Gold layout (replaces the single heap table above)
+-- Monthly range partitions on observation_time; gold_layer/gold_partitions.py
+-- creates missing months before each load and drops expired ones.
+-- Staging now uses per-connection temp tables.
+
+DROP TABLE IF EXISTS weather_observations_staging;
+
+ALTER TABLE weather_observations RENAME TO weather_observations_legacy;
+
+CREATE TABLE weather_observations (
+    location_id TEXT NOT NULL,
+    observation_time TIMESTAMP NOT NULL,
+    temperature FLOAT,
+    windspeed FLOAT,
+    winddirection FLOAT,
+    weathercode INT,
+    ingestion_time TIMESTAMP,
+    run_id UUID,
+    PRIMARY KEY (location_id, observation_time)
+) PARTITION BY RANGE (observation_time);
+
+-- BRIN: rows arrive roughly in time order, so block ranges stay tight
+CREATE INDEX weather_observations_time_brin
+    ON weather_observations USING BRIN (observation_time);
+
+CREATE INDEX weather_observations_ingestion_brin
+    ON weather_observations USING BRIN (ingestion_time);
+
+-- One partition per month (same naming as gold_partitions.partition_name),
+-- created here for every month present in the legacy rows
+DO $$
+DECLARE
+    month_start DATE;
+BEGIN
+    FOR month_start IN
+        SELECT DISTINCT date_trunc('month', observation_time)::date
+        FROM weather_observations_legacy
+    LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF weather_observations '
+            'FOR VALUES FROM (%L) TO (%L)',
+            'weather_observations_' || to_char(month_start, 'YYYY_MM'),
+            month_start,
+            (month_start + INTERVAL '1 month')::date
+        );
+    END LOOP;
+END
+$$;
+
+-- Carry over the legacy rows
+INSERT INTO weather_observations (
+    location_id, observation_time, temperature, windspeed,
+    winddirection, weathercode, ingestion_time, run_id
+)
+SELECT location_id, observation_time, temperature, windspeed,
+       winddirection, weathercode, ingestion_time, run_id
+FROM weather_observations_legacy;
+
+-- Range queries only scan the partitions they cover
+EXPLAIN SELECT * FROM weather_observations
+WHERE observation_time >= '2026-01-01' AND observation_time < '2026-01-08';
+
+
+
+-- Silver files already loaded into Gold (gold_layer/silver_ledger.py)
+
+CREATE TABLE silver_load_ledger (
+    path TEXT PRIMARY KEY,
+    size BIGINT NOT NULL,
+    etag TEXT NOT NULL,
+    row_count BIGINT NOT NULL,
+    loaded_at TIMESTAMP NOT NULL DEFAULT (now() AT TIME ZONE 'utc')
+);
+
+select * from silver_load_ledger order by loaded_at desc;
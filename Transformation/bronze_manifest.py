@@ -0,0 +1,249 @@
+# ============================================================
+# IMPORTS
+# ============================================================
+
+import re
+from datetime import datetime, date, timedelta
+
+from config import settings
+from storage.serialization import dumps, loads
+
+
+"""
+Bronze Manifest (Transformation Checkpoint)
+
+Records which Bronze objects have already been transformed so
+each run processes exactly the new keys.
+
+Bronze keys are partitioned by ingestion time
+(.../year=YYYY/month=MM/day=DD/...). The manifest keeps a
+watermark day plus the processed keys of the last few days:
+
+- no manifest yet      -> one paginated scan of the whole prefix
+- manifest present     -> paginated listings of only the day
+                          partitions from (watermark - lookback)
+                          to today
+- days that fall out of the lookback window are dropped from
+  the manifest, so it stays small
+- objects that failed to read are kept under "failed" and
+  retried by every run until they succeed, whatever the window
+"""
+
+
+PARTITION_PATTERN = re.compile(r"year=(\d{4})/month=(\d{2})/day=(\d{2})/")
+
+
+# ============================================================
+# LOAD / SAVE
+# ============================================================
+
+def empty_manifest():
+
+    return {"watermark_date": None, "processed": {}, "failed": {}, "updated_at": None}
+
+
+def load_manifest(storage, bucket=None, manifest_key=None):
+
+    bucket = bucket or settings.RAW_BUCKET
+    manifest_key = manifest_key or settings.BRONZE_MANIFEST_KEY
+
+    if not storage.exists(bucket, manifest_key):
+        return empty_manifest()
+
+    return loads(storage.get_bytes(bucket, manifest_key))
+
+
+def save_manifest(storage, manifest, bucket=None, manifest_key=None):
+
+    bucket = bucket or settings.RAW_BUCKET
+    manifest_key = manifest_key or settings.BRONZE_MANIFEST_KEY
+
+    manifest["updated_at"] = datetime.utcnow().isoformat()
+
+    storage.put_bytes(
+        bucket,
+        manifest_key,
+        dumps(manifest),
+        content_type="application/json"
+    )
+
+
+# ============================================================
+# PARTITIONS
+# ============================================================
+
+def partition_date(key):
+
+    match = PARTITION_PATTERN.search(key)
+
+    if match is None:
+        return None
+
+    return "-".join(match.groups())
+
+
+def partition_prefix(prefix, day):
+
+    return f"{prefix.rstrip('/')}/year={day:%Y}/month={day:%m}/day={day:%d}/"
+
+
+def scan_days(watermark_date, lookback_days, today=None):
+
+    today = today or datetime.utcnow().date()
+    start = date.fromisoformat(watermark_date) - timedelta(days=lookback_days)
+
+    days = []
+    day = start
+
+    while day <= today:
+        days.append(day)
+        day += timedelta(days=1)
+
+    return days
+
+
+# ============================================================
+# PENDING KEYS
+# ============================================================
+
+def list_pending_objects(storage, manifest, bucket=None, prefix=None,
+                         lookback_days=None):
+
+    """
+    Returns the Bronze objects ({"key", "size", "etag"}) under
+    prefix that the manifest has not seen yet, in listing order.
+    """
+
+    bucket = bucket or settings.RAW_BUCKET
+    prefix = (prefix or settings.RAW_PREFIX).rstrip("/") + "/"
+    lookback_days = settings.BRONZE_LOOKBACK_DAYS if lookback_days is None else lookback_days
+
+    if manifest["watermark_date"] is None:
+        listings = [storage.list_objects(bucket, prefix)]
+    else:
+        listings = [
+            storage.list_objects(bucket, partition_prefix(prefix, day))
+            for day in scan_days(manifest["watermark_date"], lookback_days)
+        ]
+
+    processed = set()
+    for keys in manifest["processed"].values():
+        processed.update(keys)
+
+    pending = []
+
+    for listing in listings:
+        for obj in listing:
+            if obj["key"] not in processed:
+                pending.append(obj)
+
+    # Earlier read failures, including ones the window has moved past
+    listed = {obj["key"] for obj in pending}
+
+    for key, obj in manifest.get("failed", {}).items():
+        if key not in listed:
+            pending.append({"key": key, "size": obj["size"], "etag": obj["etag"]})
+
+    return pending
+
+
+def mark_processed(manifest, keys, lookback_days=None):
+
+    lookback_days = settings.BRONZE_LOOKBACK_DAYS if lookback_days is None else lookback_days
+
+    days = [manifest["watermark_date"]] if manifest["watermark_date"] else []
+
+    for key in keys:
+        day = partition_date(key)
+
+        # Unpartitioned (legacy) keys are only picked up by the
+        # initial full scan and never listed again
+        if day is None:
+            continue
+
+        manifest["processed"].setdefault(day, []).append(key)
+        days.append(day)
+
+    # Read at last: no longer retried
+    failed = manifest.setdefault("failed", {})
+    for key in keys:
+        failed.pop(key, None)
+
+    manifest["watermark_date"] = max(days) if days else datetime.utcnow().date().isoformat()
+
+    # Prune days that will no longer be scanned
+    oldest = (
+        date.fromisoformat(manifest["watermark_date"]) - timedelta(days=lookback_days)
+    ).isoformat()
+
+    manifest["processed"] = {
+        day: keys
+        for day, keys in manifest["processed"].items()
+        if day >= oldest
+    }
+
+    return manifest
+
+
+def mark_failed(manifest, failed):
+
+    """
+    Records objects that could not be read ({"key", "size",
+    "etag", "error"}) so list_pending_objects returns them on
+    every later run until mark_processed clears them.
+    """
+
+    entries = manifest.setdefault("failed", {})
+
+    for obj in failed:
+        entries[obj["key"]] = {
+            "size": obj["size"],
+            "etag": obj["etag"],
+            "error": obj["error"]
+        }
+
+    return manifest
+
+
+# ============================================================
+# HISTORY (BACKFILL) MARKERS
+# ============================================================
+
+# Backfill chunks are keyed by location and date range, not by
+# ingestion day, so the day-window scan above never sees them.
+# Instead every backfill run leaves one marker object listing the
+# chunks it landed ({"objects": [{"key", "size"}, ...]}). Only the
+# markers are listed; a marker shrinks as its chunks reach Silver
+# and is deleted when empty, so no processed-key set grows.
+
+def list_history_markers(storage, bucket=None, prefix=None):
+
+    bucket = bucket or settings.RAW_BUCKET
+    prefix = (prefix or settings.HISTORY_PENDING_PREFIX).rstrip("/") + "/"
+
+    return sorted(obj["key"] for obj in storage.list_objects(bucket, prefix))
+
+
+def read_history_marker(storage, marker_key, bucket=None):
+
+    bucket = bucket or settings.RAW_BUCKET
+
+    return loads(storage.get_bytes(bucket, marker_key))["objects"]
+
+
+def save_history_marker(storage, marker_key, objects, bucket=None):
+
+    """Rewrites the marker with the chunks still pending, or deletes it."""
+
+    bucket = bucket or settings.RAW_BUCKET
+
+    if not objects:
+        storage.delete(bucket, marker_key)
+        return
+
+    storage.put_bytes(
+        bucket,
+        marker_key,
+        dumps({"objects": objects}),
+        content_type="application/json"
+    )
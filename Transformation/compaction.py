@@ -0,0 +1,282 @@
+# ============================================================
+# IMPORTS
+# ============================================================
+
+import os
+import io
+import sys
+import uuid
+from datetime import datetime, date, timedelta
+
+import pyarrow as pa
+
+# --------------------------------------------------
+# FIX IMPORT PATH (standalone execution)
+# --------------------------------------------------
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from storage.backends import get_backend
+from config import settings
+from Transformation.bronze_manifest import partition_date
+from Transformation.silver_manifest import (
+    COMPACTED_PREFIX,
+    MANIFEST_NAME,
+    partition_of,
+    is_compacted,
+    load_partition_manifest,
+    save_partition_manifest,
+    live_partition_objects
+)
+from Transformation.silver_schema import (
+    SILVER_SCHEMA,
+    FORECAST_SCHEMA,
+    conform_table,
+    write_silver_parquet
+)
+
+
+"""
+Silver Compaction Job
+
+Rewrites closed year=/month=/day= partitions of the Silver
+dataset, which fill up with one small parquet file per
+observation, into a few large files with sized row groups.
+
+Swap order per partition (see silver_manifest.py):
+
+1. delete the files superseded by the previous run, and outputs
+   of runs that never committed
+2. read the live files of the partition
+3. write the compacted files (invisible to readers until
+   the partition manifest lists them)
+4. check the compacted row count matches the inputs
+5. rewrite the partition manifest: outputs in, inputs
+   superseded; this single object write is the atomic swap
+
+Inputs stay on storage until the next run, so a reader that
+resolved the old manifest can still read them. Only partitions
+older than the grace period are touched, and files that land
+after the listing are left alone.
+"""
+
+
+# ============================================================
+# LIST PARTITIONS
+# ============================================================
+
+def list_day_partitions(storage, bucket, prefix):
+
+    """Groups Silver objects (parquet + manifests) by day partition prefix."""
+
+    partitions = {}
+
+    for obj in storage.list_objects(bucket, prefix.rstrip("/") + "/"):
+
+        if not obj["key"].endswith((".parquet", "/" + MANIFEST_NAME)):
+            continue
+
+        partitions.setdefault(partition_of(obj["key"]), []).append(obj)
+
+    return partitions
+
+
+def is_closed(partition_prefix, grace_days, today=None):
+
+    day = partition_date(partition_prefix)
+
+    if day is None:
+        return False
+
+    today = today or datetime.utcnow().date()
+
+    return date.fromisoformat(day) <= today - timedelta(days=grace_days)
+
+
+# ============================================================
+# COMPACT ONE PARTITION
+# ============================================================
+
+def release_superseded(storage, bucket, partition_prefix, objects, manifest):
+
+    """
+    Deletes files superseded by the previous run and compaction
+    outputs no manifest ever committed (a run that failed between
+    write and swap), then drops them from the manifest.
+    """
+
+    committed = {obj["key"] for obj in manifest["compacted"]}
+    orphans = [
+        obj["key"]
+        for obj in objects
+        if is_compacted(obj["key"]) and obj["key"] not in committed
+    ]
+
+    if not manifest["superseded"] and not orphans:
+        return
+
+    # Not live for any reader of the current manifest
+    for key in manifest["superseded"] + orphans:
+        storage.delete(bucket, key)
+
+    save_partition_manifest(storage, bucket, partition_prefix, {
+        "compacted": manifest["compacted"],
+        "superseded": []
+    })
+
+
+def compact_partition(storage, bucket, partition_prefix, objects,
+                      target_file_bytes=None, row_group_size=None,
+                      schema=SILVER_SCHEMA):
+
+    target_file_bytes = target_file_bytes or settings.COMPACTION_TARGET_FILE_BYTES
+    row_group_size = row_group_size or settings.COMPACTION_ROW_GROUP_SIZE
+
+    tables = [storage.open_parquet(bucket, obj["key"]).read() for obj in objects]
+
+    # Older files may have pandas-inferred types: cast to the contract
+    table = pa.concat_tables([conform_table(t, schema) for t in tables])
+    input_rows = table.num_rows
+    input_bytes = sum(obj["size"] for obj in objects)
+
+    # Estimate rows per output file from the input compression ratio
+    bytes_per_row = max(1, input_bytes // max(1, input_rows))
+    rows_per_file = max(row_group_size, target_file_bytes // bytes_per_row)
+
+    new_keys = []
+    output_bytes = 0
+
+    for offset in range(0, input_rows, rows_per_file):
+
+        buffer = io.BytesIO()
+        write_silver_parquet(
+            table.slice(offset, rows_per_file),
+            buffer,
+            row_group_size=row_group_size
+        )
+
+        key = f"{partition_prefix}{COMPACTED_PREFIX}{uuid.uuid4().hex}.parquet"
+        storage.put_bytes(bucket, key, buffer.getvalue())
+
+        new_keys.append(key)
+        output_bytes += buffer.tell()
+
+    output_rows = sum(
+        storage.open_parquet(bucket, key).metadata.num_rows for key in new_keys
+    )
+
+    if output_rows != input_rows:
+        # Roll back our own output; inputs are untouched
+        for key in new_keys:
+            storage.delete(bucket, key)
+
+        raise RuntimeError(
+            f"Compaction row mismatch in {partition_prefix}: "
+            f"{input_rows} in, {output_rows} out"
+        )
+
+    # Size / etag as the listing reports them, for the ledger
+    outputs = [
+        obj
+        for obj in storage.list_objects(bucket, f"{partition_prefix}{COMPACTED_PREFIX}")
+        if obj["key"] in new_keys
+    ]
+
+    # The swap: readers move from the inputs (every live file,
+    # earlier compacted ones included) to the outputs
+    save_partition_manifest(storage, bucket, partition_prefix, {
+        "compacted": outputs,
+        "superseded": sorted(obj["key"] for obj in objects)
+    })
+
+    return {
+        "partition": partition_prefix,
+        "files_before": len(objects),
+        "files_after": len(new_keys),
+        "bytes_before": input_bytes,
+        "bytes_after": output_bytes,
+        "rows": input_rows
+    }
+
+
+# ============================================================
+# JOB RUNNER
+# ============================================================
+
+def run_compaction(bucket=None, prefix=None, min_files=None, grace_days=None,
+                   schema=SILVER_SCHEMA):
+
+    print(f"\n===== SILVER COMPACTION STARTED ({prefix or settings.SILVER_PREFIX}) =====")
+
+    # Compacted outputs are new files to the Gold ledger; only the
+    # merge load collapses their rows with the ones already loaded
+    if settings.GOLD_LOAD_MODE == "append":
+        raise RuntimeError(
+            "Silver compaction refused: GOLD_LOAD_MODE=append would load "
+            "compacted rows into Gold a second time"
+        )
+
+    storage = get_backend()
+    bucket = bucket or settings.SILVER_BUCKET
+    prefix = prefix or settings.SILVER_PREFIX
+    min_files = min_files or settings.COMPACTION_MIN_FILES
+    grace_days = settings.COMPACTION_GRACE_DAYS if grace_days is None else grace_days
+
+    partitions = list_day_partitions(storage, bucket, prefix)
+
+    reports = []
+
+    for partition_prefix, listed in sorted(partitions.items()):
+
+        if not is_closed(partition_prefix, grace_days):
+            continue
+
+        try:
+            manifest = load_partition_manifest(storage, bucket, partition_prefix)
+
+            # Live set first: what release_superseded deletes is not in it
+            objects = live_partition_objects(listed, manifest)
+
+            release_superseded(storage, bucket, partition_prefix, listed, manifest)
+
+            if len(objects) < min_files:
+                continue
+
+            report = compact_partition(
+                storage, bucket, partition_prefix, objects, schema=schema
+            )
+
+        except Exception as e:
+            print(f"Compaction failed for {partition_prefix}: {e}")
+            continue
+
+        print(
+            f"Compacted {partition_prefix}: "
+            f"{report['files_before']} -> {report['files_after']} files, "
+            f"{report['bytes_before']} -> {report['bytes_after']} bytes"
+        )
+
+        reports.append(report)
+
+    print(
+        f"Partitions compacted: {len(reports)}, "
+        f"files {sum(r['files_before'] for r in reports)} -> "
+        f"{sum(r['files_after'] for r in reports)}, "
+        f"bytes {sum(r['bytes_before'] for r in reports)} -> "
+        f"{sum(r['bytes_after'] for r in reports)}"
+    )
+
+    print("===== SILVER COMPACTION COMPLETED =====")
+
+    return reports
+
+
+# ============================================================
+# SCRIPT ENTRY POINT (Standalone Execution)
+# ============================================================
+
+if __name__ == "__main__":
+    run_compaction()
+    run_compaction(prefix=settings.SILVER_HOURLY_PREFIX, schema=FORECAST_SCHEMA)
+    run_compaction(prefix=settings.SILVER_DAILY_PREFIX, schema=FORECAST_SCHEMA)
@@ -0,0 +1,269 @@
+# ============================================================
+# IMPORTS
+# ============================================================
+
+import os
+import json
+import sqlite3
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+
+"""
+Silver Deduplication Index
+
+Persistent (SQLite) index of
+(location_id, observation_time) -> content hash
+for every observation already written to Silver.
+
+Before a Parquet write each batch row is classified as:
+
+- new        -> key never seen, written
+- duplicate  -> same key, same values, dropped
+- revision   -> same key, changed values, written with
+                is_revision = True
+
+Hashes are computed for the whole batch in one vectorized
+pass, and lookups are one join against a temp table.
+
+Forecast sections (hourly / daily blocks) have their own table,
+(location_id, section, content_hash), recorded only once the
+forecast rows are in Silver. A batch whose forecast write failed
+is therefore written again on retry, even though its
+observations are already known duplicates by then.
+"""
+
+
+# ============================================================
+# INDEX CONFIG
+# ============================================================
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INDEX_FILE = os.path.join(BASE_DIR, "state", "dedup_index.sqlite")
+
+KEY_COLUMNS = ["location_id", "observation_time"]
+VALUE_COLUMNS = ["temperature", "windspeed", "winddirection", "weathercode"]
+
+
+# ============================================================
+# INDEX STORE
+# ============================================================
+
+def open_index(path=INDEX_FILE):
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    conn = sqlite3.connect(path)
+
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS observations (
+            location_id TEXT NOT NULL,
+            observation_time TEXT NOT NULL,
+            content_hash INTEGER NOT NULL,
+            PRIMARY KEY (location_id, observation_time)
+        ) WITHOUT ROWID
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS forecast_blocks (
+            location_id TEXT NOT NULL,
+            section TEXT NOT NULL,
+            content_hash INTEGER NOT NULL,
+            PRIMARY KEY (location_id, section, content_hash)
+        ) WITHOUT ROWID
+        """
+    )
+    conn.commit()
+
+    return conn
+
+
+# ============================================================
+# HASH + CLASSIFY
+# ============================================================
+
+def index_keys(df):
+
+    return pd.DataFrame({
+        "location_id": df["location_id"].astype("string").fillna("").to_numpy(),
+        "observation_time": df["observation_time"].dt.strftime("%Y-%m-%dT%H:%M:%S").to_numpy(),
+        # uint64 -> int64 so SQLite can store it
+        "content_hash": pd.util.hash_pandas_object(
+            df[VALUE_COLUMNS], index=False
+        ).to_numpy().view(np.int64)
+    })
+
+
+def classify(conn, df):
+
+    """
+    Returns (rows_to_write, counts). rows_to_write carries an
+    is_revision flag and excludes exact duplicates, both
+    against the index and within the batch itself.
+    """
+
+    keys = index_keys(df)
+
+    # Exact duplicates inside the batch
+    keep = ~keys.duplicated(subset=KEY_COLUMNS + ["content_hash"]).to_numpy()
+    df = df[keep].reset_index(drop=True)
+    keys = keys[keep].reset_index(drop=True)
+
+    conn.execute("DROP TABLE IF EXISTS temp.batch_keys")
+    conn.execute(
+        """
+        CREATE TEMP TABLE batch_keys (
+            row_id INTEGER PRIMARY KEY,
+            location_id TEXT,
+            observation_time TEXT
+        )
+        """
+    )
+    conn.executemany(
+        "INSERT INTO temp.batch_keys VALUES (?, ?, ?)",
+        zip(
+            range(len(keys)),
+            keys["location_id"].tolist(),
+            keys["observation_time"].tolist()
+        )
+    )
+
+    existing = pd.DataFrame(
+        conn.execute(
+            """
+            SELECT b.row_id, o.content_hash
+            FROM temp.batch_keys b
+            JOIN observations o
+              ON o.location_id = b.location_id
+             AND o.observation_time = b.observation_time
+            """
+        ).fetchall(),
+        columns=["row_id", "content_hash"]
+    )
+
+    existing_hash = pd.Series(pd.NA, index=keys.index, dtype="Int64")
+    existing_hash.loc[existing["row_id"].to_numpy()] = existing["content_hash"].to_numpy()
+
+    seen = existing_hash.notna().to_numpy()
+    same = seen & (existing_hash.fillna(0).to_numpy() == keys["content_hash"].to_numpy())
+
+    # Same key with different values later in the batch is a revision too
+    repeated_in_batch = keys.duplicated(subset=KEY_COLUMNS).to_numpy()
+
+    rows = df[~same].copy()
+    rows["is_revision"] = (seen | repeated_in_batch)[~same]
+
+    counts = {
+        "new": int((~seen & ~repeated_in_batch).sum()),
+        "duplicate": int(same.sum() + (~keep).sum()),
+        "revision": int(rows["is_revision"].sum())
+    }
+
+    return rows.reset_index(drop=True), counts
+
+
+def record(conn, df):
+
+    """Stores the latest content hash for every written row."""
+
+    keys = index_keys(df)
+
+    conn.executemany(
+        "INSERT OR REPLACE INTO observations VALUES (?, ?, ?)",
+        zip(
+            keys["location_id"].tolist(),
+            keys["observation_time"].tolist(),
+            keys["content_hash"].tolist()
+        )
+    )
+    conn.commit()
+
+
+# ============================================================
+# FORECAST BLOCKS
+# ============================================================
+
+BLOCK_KEY_COLUMNS = ["location_id", "section", "content_hash"]
+
+
+def block_hash(block):
+
+    """
+    Content hash of one forecast block, stable across processes
+    (canonical JSON + blake2b; Python's hash() is salted).
+    """
+
+    canonical = json.dumps(block, sort_keys=True, separators=(",", ":"), default=str)
+    digest = hashlib.blake2b(canonical.encode("utf-8"), digest_size=8).digest()
+
+    return int.from_bytes(digest, "little", signed=True)
+
+
+def unseen_blocks(conn, keys):
+
+    """
+    keys: DataFrame with BLOCK_KEY_COLUMNS plus any caller
+    columns. Returns the rows whose block is neither in the
+    index nor repeated earlier in the batch.
+    """
+
+    keys = keys.drop_duplicates(subset=BLOCK_KEY_COLUMNS).reset_index(drop=True)
+
+    if keys.empty:
+        return keys
+
+    conn.execute("DROP TABLE IF EXISTS temp.batch_blocks")
+    conn.execute(
+        """
+        CREATE TEMP TABLE batch_blocks (
+            row_id INTEGER PRIMARY KEY,
+            location_id TEXT,
+            section TEXT,
+            content_hash INTEGER
+        )
+        """
+    )
+    conn.executemany(
+        "INSERT INTO temp.batch_blocks VALUES (?, ?, ?, ?)",
+        zip(
+            range(len(keys)),
+            keys["location_id"].tolist(),
+            keys["section"].tolist(),
+            keys["content_hash"].tolist()
+        )
+    )
+
+    seen = [
+        row_id
+        for (row_id,) in conn.execute(
+            """
+            SELECT b.row_id
+            FROM temp.batch_blocks b
+            JOIN forecast_blocks f
+              ON f.location_id = b.location_id
+             AND f.section = b.section
+             AND f.content_hash = b.content_hash
+            """
+        )
+    ]
+
+    return keys.drop(index=seen).reset_index(drop=True)
+
+
+def record_blocks(conn, keys):
+
+    """Marks forecast blocks as written to Silver."""
+
+    conn.executemany(
+        "INSERT OR IGNORE INTO forecast_blocks VALUES (?, ?, ?)",
+        zip(
+            keys["location_id"].tolist(),
+            keys["section"].tolist(),
+            keys["content_hash"].tolist()
+        )
+    )
+    conn.commit()
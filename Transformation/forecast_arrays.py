@@ -0,0 +1,182 @@
+# ============================================================
+# IMPORTS
+# ============================================================
+
+import numpy as np
+import pandas as pd
+
+
+"""
+Forecast Array Explosion (Hourly / Daily)
+
+Open-Meteo returns hourly and daily sections as parallel arrays:
+
+    "hourly": {"time": [...], "temperature_2m": [...], ...}
+
+This module turns them into long-format rows
+(location, time, variable, value) for a whole batch of payloads.
+The only Python loop is over payloads and variables. Each array
+is converted with NumPy in one call, and the columns are built
+with np.concatenate / np.repeat. Nothing is done per element.
+
+A malformed array never aborts the batch: a block whose times
+do not parse is skipped, and a variable array that is not
+numeric is coerced (bad entries -> NaN) or, failing that, skipped.
+"""
+
+
+FORECAST_COLUMNS = [
+    "run_id",
+    "location_id",
+    "ingestion_time",
+    "forecast_time",
+    "variable",
+    "value"
+]
+
+
+# ============================================================
+# LOCATION IDS
+# ============================================================
+
+def format_coordinate(value):
+
+    try:
+        return f"{float(value):.4f}"
+
+    except (TypeError, ValueError):
+        return "nan"
+
+
+def envelope_location_ids(envelopes):
+
+    """
+    metadata.location_id per envelope; older envelopes have
+    none, so it is derived from the payload coordinates.
+    """
+
+    metadata = pd.json_normalize([envelope.get("metadata") or {} for envelope in envelopes])
+    metadata = metadata.reindex(columns=["location_id"])
+
+    derived_locations = pd.Series([
+        f"{format_coordinate(payload.get('latitude'))}_{format_coordinate(payload.get('longitude'))}"
+        for payload in ((envelope.get("payload") or {}) for envelope in envelopes)
+    ], dtype="string")
+
+    return metadata["location_id"].astype("string").fillna(derived_locations).to_numpy()
+
+
+# ============================================================
+# ARRAY CONVERSION
+# ============================================================
+
+def parse_times(raw):
+
+    """ISO strings -> datetime64[s] in one C-level call; None if malformed."""
+
+    try:
+        return np.asarray(raw, dtype="datetime64[s]")
+
+    except (ValueError, TypeError):
+        return None
+
+
+def parse_values(raw):
+
+    """
+    Numeric array -> float64 (None -> NaN). Non-numeric entries
+    are coerced to NaN; None if the array cannot be read at all.
+    """
+
+    try:
+        return np.asarray(raw, dtype=np.float64)
+
+    except (ValueError, TypeError):
+        pass
+
+    try:
+        return pd.to_numeric(pd.Series(raw, dtype=object), errors="coerce").to_numpy(np.float64)
+
+    except (ValueError, TypeError):
+        return None
+
+
+# ============================================================
+# EXPLODE
+# ============================================================
+
+def explode_forecast_arrays(envelopes, section, variables):
+
+    """
+    Returns a long-format DataFrame with one row per
+    (payload, time step, requested variable) for the given
+    section ("hourly" or "daily").
+    """
+
+    if not variables:
+        return pd.DataFrame(columns=FORECAST_COLUMNS)
+
+    times = []
+    values = []
+    variable_codes = []
+    envelope_index = []
+
+    for i, envelope in enumerate(envelopes):
+
+        block = (envelope.get("payload") or {}).get(section)
+
+        if not isinstance(block, dict) or not block.get("time"):
+            continue
+
+        block_times = parse_times(block["time"])
+
+        if block_times is None or block_times.ndim != 1:
+            print(f"Skipped {section} block of envelope {i}: malformed time array")
+            continue
+
+        n = len(block_times)
+
+        for code, variable in enumerate(variables):
+
+            raw = block.get(variable)
+
+            if not isinstance(raw, list) or len(raw) != n:
+                continue
+
+            block_values = parse_values(raw)
+
+            if block_values is None or block_values.shape != (n,):
+                print(f"Skipped {section}.{variable} of envelope {i}: malformed array")
+                continue
+
+            values.append(block_values)
+            times.append(block_times)
+            variable_codes.append(np.full(n, code, dtype=np.int32))
+            envelope_index.append(np.full(n, i, dtype=np.int64))
+
+    if not values:
+        return pd.DataFrame(columns=FORECAST_COLUMNS)
+
+    envelope_index = np.concatenate(envelope_index)
+
+    # Per-envelope metadata, broadcast to rows by index
+    metadata = pd.json_normalize([envelope.get("metadata") or {} for envelope in envelopes])
+    metadata = metadata.reindex(columns=["run_id", "ingestion_timestamp"])
+
+    run_ids = metadata["run_id"].astype("string").to_numpy()
+    location_ids = envelope_location_ids(envelopes)
+    ingestion_times = pd.to_datetime(
+        metadata["ingestion_timestamp"], errors="coerce"
+    ).to_numpy()
+
+    return pd.DataFrame({
+        "run_id": pd.Categorical(run_ids[envelope_index]),
+        "location_id": pd.Categorical(location_ids[envelope_index]),
+        "ingestion_time": ingestion_times[envelope_index],
+        "forecast_time": pd.to_datetime(np.concatenate(times)),
+        "variable": pd.Categorical.from_codes(
+            np.concatenate(variable_codes),
+            categories=list(variables)
+        ),
+        "value": np.concatenate(values)
+    })
@@ -0,0 +1,86 @@
+# ============================================================
+# IMPORTS
+# ============================================================
+
+import pandas as pd
+
+from Transformation.forecast_arrays import explode_forecast_arrays
+
+
+"""
+Backfilled History -> Silver Observations
+
+Backfill chunks (Ingestion.run_backfill, archive endpoint) carry
+no current_weather block, only hourly arrays of past values:
+
+    "hourly": {"time": [...], "temperature_2m": [...], ...}
+
+Each hourly time step is an observation. The arrays are exploded
+with explode_forecast_arrays and pivoted back to one row per
+(location, time), in the column layout of normalize_envelopes,
+so history goes through the same validation / dedup / Silver
+write as live observations and reaches Gold like any other row.
+"""
+
+
+# ============================================================
+# VARIABLE MAPPING
+# ============================================================
+
+# Archive variable -> Silver column (old and new API names)
+HISTORY_SILVER_VARIABLES = {
+    "temperature_2m": "temperature",
+    "windspeed_10m": "windspeed",
+    "wind_speed_10m": "windspeed",
+    "winddirection_10m": "winddirection",
+    "wind_direction_10m": "winddirection",
+    "weathercode": "weathercode",
+    "weather_code": "weathercode"
+}
+
+OBSERVATION_COLUMNS = [
+    "run_id",
+    "location_id",
+    "ingestion_time",
+    "temperature",
+    "windspeed",
+    "winddirection",
+    "weathercode",
+    "observation_time"
+]
+
+ROW_KEY = ["run_id", "location_id", "ingestion_time", "forecast_time"]
+
+
+# ============================================================
+# CONVERT
+# ============================================================
+
+def history_observations(envelopes):
+
+    """
+    Returns one row per (history envelope, hourly time step)
+    with the raw Silver observation columns.
+    """
+
+    long = explode_forecast_arrays(envelopes, "hourly", list(HISTORY_SILVER_VARIABLES))
+
+    if long.empty:
+        return pd.DataFrame(columns=OBSERVATION_COLUMNS)
+
+    long["variable"] = long["variable"].map(HISTORY_SILVER_VARIABLES)
+
+    wide = (
+        long.groupby(ROW_KEY + ["variable"], observed=True, sort=False)["value"]
+        .first()
+        .unstack("variable")
+        .reset_index()
+        .rename(columns={"forecast_time": "observation_time"})
+    )
+
+    wide.columns.name = None
+
+    for column in ["run_id", "location_id"]:
+        wide[column] = wide[column].astype(str)
+
+    return wide.reindex(columns=OBSERVATION_COLUMNS)
@@ -0,0 +1,134 @@
+# ============================================================
+# IMPORTS
+# ============================================================
+
+from storage.serialization import dumps, loads
+
+
+"""
+Silver Partition Manifests
+
+Compaction swaps a day partition's small files for compacted
+ones by rewriting one object, <partition>/_manifest.json:
+
+    {"compacted": [{"key", "size", "etag"}, ...],
+     "superseded": [key, ...]}
+
+Every Silver reader resolves a partition through it:
+
+- compacted-*.parquet files are live only when the manifest
+  lists them under "compacted" (outputs of a run that never
+  committed stay invisible)
+- files listed under "superseded" are no longer live, even
+  while they still exist
+
+A single object write is atomic, so a reader sees either the
+inputs or the compacted outputs of a partition, never both and
+never neither. Superseded files are deleted by the next
+compaction run, so readers that resolved the previous manifest
+can still finish reading them.
+"""
+
+
+# ============================================================
+# NAMING
+# ============================================================
+
+MANIFEST_NAME = "_manifest.json"
+COMPACTED_PREFIX = "compacted-"
+
+
+def partition_of(key):
+
+    return key.rsplit("/", 1)[0] + "/"
+
+
+def is_compacted(key):
+
+    return key.rsplit("/", 1)[-1].startswith(COMPACTED_PREFIX)
+
+
+def manifest_key(partition_prefix):
+
+    return f"{partition_prefix}{MANIFEST_NAME}"
+
+
+# ============================================================
+# LOAD / SAVE
+# ============================================================
+
+def empty_partition_manifest():
+
+    return {"compacted": [], "superseded": []}
+
+
+def load_partition_manifest(storage, bucket, partition_prefix):
+
+    key = manifest_key(partition_prefix)
+
+    if not storage.exists(bucket, key):
+        return empty_partition_manifest()
+
+    return loads(storage.get_bytes(bucket, key))
+
+
+def save_partition_manifest(storage, bucket, partition_prefix, manifest):
+
+    storage.put_bytes(
+        bucket,
+        manifest_key(partition_prefix),
+        dumps(manifest),
+        content_type="application/json"
+    )
+
+
+# ============================================================
+# LIVE FILES
+# ============================================================
+
+def live_partition_objects(objects, manifest):
+
+    """
+    The live parquet objects of one partition: listed files that
+    are neither compaction outputs nor superseded, plus the
+    committed compacted files.
+    """
+
+    superseded = set(manifest["superseded"])
+
+    live = [
+        obj
+        for obj in objects
+        if obj["key"].endswith(".parquet")
+        and not is_compacted(obj["key"])
+        and obj["key"] not in superseded
+    ]
+
+    return live + list(manifest["compacted"])
+
+
+def live_objects(storage, bucket, listing):
+
+    """
+    Resolves a Silver listing (any number of partitions) to its
+    live parquet objects. Only partitions whose listing contains
+    a manifest cost an extra GET.
+    """
+
+    partitions = {}
+
+    for obj in listing:
+        partitions.setdefault(partition_of(obj["key"]), []).append(obj)
+
+    live = []
+
+    for partition_prefix, objects in partitions.items():
+
+        if any(obj["key"].endswith("/" + MANIFEST_NAME) for obj in objects):
+            manifest = load_partition_manifest(storage, bucket, partition_prefix)
+        else:
+            manifest = empty_partition_manifest()
+
+        live.extend(live_partition_objects(objects, manifest))
+
+    return live
@@ -0,0 +1,133 @@
+# ============================================================
+# IMPORTS
+# ============================================================
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from config import settings
+
+
+"""
+Silver Schema Contract
+
+Declared Arrow schema for the Silver weather dataset and the
+tuned Parquet writer used for every Silver file. The Gold
+loader reads with this schema, so older files written with
+pandas-inferred types are cast to it on read.
+
+- float32 measurements
+- int16 weathercode (WMO codes are 0-99)
+- dictionary-encoded run_id / location_id
+- UTC timezone-aware timestamps
+
+FORECAST_SCHEMA is the long-format contract for the exploded
+hourly / daily forecast datasets (one row per time x variable).
+"""
+
+
+# ============================================================
+# SCHEMA
+# ============================================================
+
+DICTIONARY_STRING = pa.dictionary(pa.int32(), pa.string())
+UTC_TIMESTAMP = pa.timestamp("us", tz="UTC")
+
+SILVER_SCHEMA = pa.schema([
+    pa.field("run_id", DICTIONARY_STRING),
+    pa.field("location_id", DICTIONARY_STRING),
+    pa.field("ingestion_time", UTC_TIMESTAMP),
+    pa.field("temperature", pa.float32()),
+    pa.field("windspeed", pa.float32()),
+    pa.field("winddirection", pa.float32()),
+    pa.field("weathercode", pa.int16()),
+    pa.field("observation_time", UTC_TIMESTAMP),
+    pa.field("is_revision", pa.bool_())
+])
+
+
+FORECAST_SCHEMA = pa.schema([
+    pa.field("run_id", DICTIONARY_STRING),
+    pa.field("location_id", DICTIONARY_STRING),
+    pa.field("ingestion_time", UTC_TIMESTAMP),
+    pa.field("forecast_time", UTC_TIMESTAMP),
+    pa.field("variable", DICTIONARY_STRING),
+    pa.field("value", pa.float32())
+])
+
+
+# ============================================================
+# CONVERSION
+# ============================================================
+
+def to_silver_table(df, schema=SILVER_SCHEMA):
+
+    """
+    Builds an Arrow table with the declared schema from a
+    transformed DataFrame. Naive timestamps are taken as UTC
+    (Open-Meteo returns GMT; ingestion uses utcnow).
+    """
+
+    df = df.copy()
+
+    for field in schema:
+        if pa.types.is_timestamp(field.type) and field.name in df:
+            column = df[field.name]
+            if getattr(column.dt, "tz", None) is None:
+                df[field.name] = column.dt.tz_localize("UTC")
+
+    return pa.Table.from_pandas(
+        df[schema.names],
+        schema=schema,
+        preserve_index=False
+    )
+
+
+def conform_table(table, schema=SILVER_SCHEMA):
+
+    """
+    Casts an existing Arrow table to the declared schema,
+    filling columns it lacks with nulls.
+    """
+
+    columns = []
+
+    for field in schema:
+        if field.name in table.column_names:
+            column = table.column(field.name)
+
+            if pa.types.is_timestamp(field.type) and column.type.tz is None:
+                column = column.cast(pa.timestamp(field.type.unit)).cast(field.type)
+
+            columns.append(column.cast(field.type))
+        else:
+            columns.append(pa.nulls(table.num_rows, type=field.type))
+
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+# ============================================================
+# PARQUET WRITER
+# ============================================================
+
+# Codecs that accept a compression level
+LEVELED_CODECS = {"zstd", "gzip", "brotli"}
+
+
+def write_silver_parquet(table, sink, row_group_size=None):
+
+    compression_level = (
+        settings.SILVER_COMPRESSION_LEVEL
+        if settings.SILVER_COMPRESSION in LEVELED_CODECS
+        else None
+    )
+
+    pq.write_table(
+        table,
+        sink,
+        compression=settings.SILVER_COMPRESSION,
+        compression_level=compression_level,
+        row_group_size=row_group_size or settings.SILVER_ROW_GROUP_SIZE,
+        write_statistics=settings.SILVER_WRITE_STATISTICS,
+        use_dictionary=True
+    )
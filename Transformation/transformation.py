@@ -2,17 +2,52 @@
 # IMPORTS
 # ============================================================
 
+import os
+import sys
+import uuid
 import pandas as pd
-import boto3
-import json
 import io
+from contextlib import closing
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# --------------------------------------------------
+# FIX IMPORT PATH (standalone execution)
+# --------------------------------------------------
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from storage.backends import get_backend
+from storage.serialization import iter_envelopes
+from Transformation.silver_schema import (
+    SILVER_SCHEMA,
+    FORECAST_SCHEMA,
+    to_silver_table,
+    write_silver_parquet
+)
+from Transformation.forecast_arrays import explode_forecast_arrays, envelope_location_ids
+from Transformation.history import history_observations
+from Transformation.validation import validate_batch, QUARANTINE_SCHEMA
+from Transformation import dedup_index
+from Transformation.bronze_manifest import (
+    load_manifest,
+    save_manifest,
+    list_pending_objects,
+    mark_processed,
+    mark_failed,
+    list_history_markers,
+    read_history_marker,
+    save_history_marker
+)
+from config import settings
 
 
 """
 Weather Data Transformation (Silver Layer)
 
-Reads raw weather JSON from S3 Bronze layer,
+Reads new raw weather JSON from the Bronze layer
+(S3 or local storage backend, tracked by a manifest),
 extracts required fields,
 converts to structured dataframe,
 and uploads partitioned parquet to Silver layer.
@@ -20,128 +55,613 @@ and uploads partitioned parquet to Silver layer.
 
 
 # ============================================================
-# READ RAW JSON FROM S3 (BRONZE)
+# FETCH CONFIG
 # ============================================================
 
-def read_json_file():
+# Concurrent Bronze GETs (bounded; S3 latency dominates small objects)
+FETCH_MAX_WORKERS = 16
 
-    # Create S3 client
-    s3 = boto3.client("s3")
+# Concurrent Silver partition uploads
+UPLOAD_MAX_WORKERS = 8
 
-    bucket_name = "weather-data-raw-bhanu"
+# Estimated in-memory size of parsed envelopes relative to the
+# stored object size (Python objects vs compressed / plain JSON)
+COMPRESSED_EXPANSION = 40
+PLAIN_EXPANSION = 8
 
-    # List objects
-    response = s3.list_objects_v2(Bucket=bucket_name)
 
-    if "Contents" not in response:
-        print("No raw files found")
-        return None
+# ============================================================
+# SILVER COLUMN MAPPING (flattened envelope -> Silver)
+# ============================================================
 
-    # Pick first file (current logic)
-    first_file_key = response["Contents"][0]["Key"]
-    print(f"Reading file: {first_file_key}")
+SILVER_COLUMNS = {
+    "metadata.run_id": "run_id",
+    "metadata.location_id": "location_id",
+    "metadata.ingestion_timestamp": "ingestion_time",
+    "payload.current_weather.temperature": "temperature",
+    "payload.current_weather.windspeed": "windspeed",
+    "payload.current_weather.winddirection": "winddirection",
+    "payload.current_weather.weathercode": "weathercode",
+    "payload.current_weather.time": "observation_time",
+    "payload.latitude": "latitude",
+    "payload.longitude": "longitude"
+}
 
-    # Read object
-    obj = s3.get_object(
-        Bucket=bucket_name,
-        Key=first_file_key
-    )
 
-    raw_data = json.loads(
-        obj["Body"].read().decode("utf-8")
-    )
+# ============================================================
+# DECODE BRONZE OBJECTS
+# ============================================================
 
-    # Extract payload
-    current_weather = raw_data["payload"].get("current_weather")
-
-    # Build Silver schema record
-    transformed_record = {
-        "run_id": raw_data["metadata"]["run_id"],
-        "ingestion_time": raw_data["metadata"]["ingestion_timestamp"],
-        "temperature": current_weather["temperature"],
-        "windspeed": current_weather["windspeed"],
-        "winddirection": current_weather["winddirection"],
-        "weathercode": current_weather["weathercode"],
-        "observation_time": current_weather["time"]
-    }
+def read_bronze_object(storage, bucket, key):
 
-    print("Transformed Record:")
-    print(transformed_record)
+    """
+    Returns the list of enriched envelopes in a Bronze object,
+    parsed straight from the object stream
+    (see storage/serialization.py for the supported formats).
+    """
 
-    return transformed_record
+    with closing(storage.open_stream(bucket, key)) as stream:
+        return list(iter_envelopes(key, stream))
 
 
 # ============================================================
-# UPLOAD PARQUET TO S3 (SILVER)
+# BATCH FLATTEN (MANY ENVELOPES -> ONE TYPED DATAFRAME)
 # ============================================================
 
-def upload_to_s3(df):
+def fetch_bronze_objects(keys, storage=None, max_workers=FETCH_MAX_WORKERS):
 
-    print("\nUploading transformed data to S3 (Silver Layer)...")
+    """
+    Downloads and parses Bronze objects concurrently and yields
+    (key, envelopes, error) as each one completes. At most
+    2 x max_workers objects are in flight, and a failed object
+    is reported with its error instead of aborting the batch.
+    """
+
+    storage = storage or get_backend()
+    keys = iter(keys)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+
+        in_flight = {}
+
+        def submit_next():
+            key = next(keys, None)
+            if key is not None:
+                future = executor.submit(
+                    read_bronze_object, storage, settings.RAW_BUCKET, key
+                )
+                in_flight[future] = key
+
+        for _ in range(max_workers * 2):
+            submit_next()
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                key = in_flight.pop(future)
+                submit_next()
+
+                try:
+                    yield key, future.result(), None
+
+                except Exception as e:
+                    yield key, None, f"{type(e).__name__}: {e}"
+
+
+def read_bronze_envelopes(keys, storage=None):
+
+    """
+    Returns (envelopes, succeeded_keys, failed) for the given
+    keys, fetched in parallel.
+    """
+
+    envelopes = []
+    succeeded_keys = []
+    failed = []
+
+    for key, key_envelopes, error in fetch_bronze_objects(keys, storage):
+
+        if error is not None:
+            print(f"Failed to read {key}: {error}")
+            failed.append({"key": key, "error": error})
+            continue
+
+        envelopes.extend(key_envelopes)
+        succeeded_keys.append(key)
+
+    return envelopes, succeeded_keys, failed
+
+
+def normalize_envelopes(envelopes):
+
+    """
+    Flattens all envelopes in one json_normalize call into the
+    Silver column names, values still as they came from the API.
+    """
+
+    flat = pd.json_normalize(envelopes)
+
+    # Envelopes from older runs may miss some fields
+    df = flat.reindex(columns=list(SILVER_COLUMNS)).rename(columns=SILVER_COLUMNS)
+
+    # Position in the input list, to trace rows back to envelopes
+    df["envelope"] = df.index
+
+    # Payloads without a current_weather block carry nothing for this
+    # table; partial blocks stay in and are judged by validation
+    current = [name for path, name in SILVER_COLUMNS.items() if ".current_weather." in path]
+    df = df[df[current].notna().any(axis=1)].reset_index(drop=True)
+
+    # Older envelopes have no location_id: derive it from coordinates
+    missing = df["location_id"].isna()
+
+    if missing.any():
+        # An all-null column comes back as float
+        df["location_id"] = df["location_id"].astype(object)
+        df.loc[missing, "location_id"] = (
+            pd.to_numeric(df.loc[missing, "latitude"], errors="coerce").map("{:.4f}".format)
+            + "_"
+            + pd.to_numeric(df.loc[missing, "longitude"], errors="coerce").map("{:.4f}".format)
+        )
+
+    return df.drop(columns=["latitude", "longitude"])
+
+
+def type_columns(raw):
+
+    """
+    Types every column once for the whole batch. Values that do
+    not parse become nulls (never raise); the validation stage
+    reports them as type errors.
+    """
+
+    df = raw.copy()
+
+    # Fix datatypes (vectorized, whole batch)
+    df["ingestion_time"] = pd.to_datetime(df["ingestion_time"], errors="coerce")
+    df["observation_time"] = pd.to_datetime(df["observation_time"], errors="coerce")
+
+    for column in ["temperature", "windspeed", "winddirection"]:
+        df[column] = pd.to_numeric(df[column], errors="coerce")
 
-    s3 = boto3.client("s3")
-    bucket_name = "weather-data-processed-bhanuu"
+    codes = pd.to_numeric(df["weathercode"], errors="coerce")
+    df["weathercode"] = codes.where(codes % 1 == 0).astype("Int64")
 
-    # Event-time partitioning
-    event_time = df["observation_time"].iloc[0]
+    df["run_id"] = df["run_id"].astype("string")
+    df["location_id"] = df["location_id"].astype("string")
 
-    year = event_time.strftime("%Y")
-    month = event_time.strftime("%m")
-    day = event_time.strftime("%d")
+    # Set by the dedup stage for changed values of a known key
+    df["is_revision"] = False
 
-    # Create parquet in memory
+    return df
+
+
+# ============================================================
+# UPLOAD PARQUET TO S3 (SILVER)
+# ============================================================
+
+def write_partition_file(storage, bucket_name, prefix, group, time_column, schema):
+
+    # Event-time partition of this group
+    event_time = group[time_column].min()
+    location = group["location_slug"].iloc[0]
+
+    # Create parquet in memory (declared Silver schema + tuned writer)
     parquet_buffer = io.BytesIO()
-    df.to_parquet(parquet_buffer, index=False)
+    write_silver_parquet(to_silver_table(group, schema), parquet_buffer)
 
     # Partitioned path
     file_name = (
-        f"silver/weather/"
-        f"year={year}/"
-        f"month={month}/"
-        f"day={day}/"
-        f"weather_{event_time.strftime('%H%M%S')}.parquet"
+        f"{prefix}/"
+        f"year={event_time:%Y}/"
+        f"month={event_time:%m}/"
+        f"day={event_time:%d}/"
+        f"weather_{location}_{event_time:%H%M%S}_{uuid.uuid4().hex[:8]}.parquet"
     )
 
     # Upload
-    s3.put_object(
-        Bucket=bucket_name,
-        Key=file_name,
-        Body=parquet_buffer.getvalue()
+    storage.put_bytes(
+        bucket_name,
+        file_name,
+        parquet_buffer.getvalue()
+    )
+
+    return {
+        "key": file_name,
+        "partition": f"year={event_time:%Y}/month={event_time:%m}/day={event_time:%d}",
+        "location_id": group["location_id"].iloc[0],
+        "rows": len(group),
+        "bytes": parquet_buffer.tell()
+    }
+
+
+def write_partitioned(df, prefix=None, max_workers=UPLOAD_MAX_WORKERS,
+                      time_column="observation_time", schema=SILVER_SCHEMA):
+
+    """
+    Splits df by event year/month/day and location, writes each
+    group to its own Silver partition (uploads in parallel) and
+    returns a manifest with one entry per file written.
+    """
+
+    storage = get_backend()
+    bucket_name = settings.SILVER_BUCKET
+    prefix = prefix or settings.SILVER_PREFIX
+
+    df = df.copy()
+
+    # Location ids end up in file names: keep them path-safe
+    df["location_slug"] = (
+        df["location_id"].astype("string").fillna("unknown")
+        .str.replace(r"[^A-Za-z0-9_.-]", "-", regex=True)
     )
 
-    print(f"✅ Uploaded partitioned file: {file_name}")
+    observation_day = df[time_column].dt.floor("D")
+
+    groups = [
+        group
+        for _, group in df.groupby([observation_day, "location_slug"], sort=True)
+    ]
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(groups)))) as executor:
+        manifest = list(executor.map(
+            lambda group: write_partition_file(
+                storage, bucket_name, prefix, group, time_column, schema
+            ),
+            groups
+        ))
+
+    return manifest
+
+
+def upload_to_s3(df):
+
+    print("\nUploading transformed data to S3 (Silver Layer)...")
+
+    manifest = write_partitioned(df)
+
+    for entry in manifest:
+        print(f"✅ Uploaded partitioned file: {entry['key']} ({entry['rows']} rows)")
+
+    print(f"Files written: {len(manifest)}, rows: {sum(e['rows'] for e in manifest)}")
+
+    return manifest
 
 
 # ============================================================
 # PIPELINE RUNNER (USED BY ORCHESTRATOR)
 # ============================================================
 
+def write_observations(raw):
+
+    """
+    Type -> validate -> dedup -> partitioned Silver write for
+    raw observation rows (normalize_envelopes layout). Returns
+    the rows that passed validation (written or duplicates).
+    """
+
+    df = type_columns(raw) if not raw.empty else raw
+    print(f"Rows after flattening: {len(df)}")
+
+    if not df.empty:
+
+        # Range / null / type / domain checks; bad rows -> quarantine
+        df, quarantined = validate_batch(df, raw)
+        print(f"Validation: {len(df)} passed, {len(quarantined)} quarantined")
+
+        if not quarantined.empty:
+            write_partitioned(
+                quarantined,
+                prefix=settings.SILVER_QUARANTINE_PREFIX,
+                time_column="quarantined_at",
+                schema=QUARANTINE_SCHEMA
+            )
+
+    valid = df
+
+    if not df.empty:
+
+        # Drop exact duplicates, flag revisions (persistent index)
+        index = dedup_index.open_index()
+        df, counts = dedup_index.classify(index, df)
+        print(f"Dedup: {counts}")
+
+        if not df.empty:
+
+            # Upload to Silver
+            upload_to_s3(df)
+            dedup_index.record(index, df)
+
+        index.close()
+
+    return valid
+
+
+def forecast_block_keys(envelopes, section, location_ids, excluded):
+
+    """
+    One (envelope, location_id, section, content_hash) row per
+    envelope carrying the section, except the excluded ones
+    (observation quarantined: the payload is suspect).
+    """
+
+    rows = []
+
+    for i, envelope in enumerate(envelopes):
+
+        block = (envelope.get("payload") or {}).get(section)
+
+        if not block or i in excluded:
+            continue
+
+        rows.append((i, location_ids[i], section, dedup_index.block_hash(block)))
+
+    return pd.DataFrame(rows, columns=["envelope"] + dedup_index.BLOCK_KEY_COLUMNS)
+
+
+def write_forecasts(envelopes, excluded):
+
+    """
+    Hourly / daily forecast arrays -> long-format datasets.
+    Blocks already in Silver or repeated in the batch are
+    skipped (forecast block index); a block is recorded only
+    after its rows are written, independent of whether the
+    envelope's observation was new or a duplicate.
+    """
+
+    index = dedup_index.open_index()
+    location_ids = envelope_location_ids(envelopes)
+
+    for section, variables, prefix in [
+        ("hourly", settings.HOURLY_VARIABLES, settings.SILVER_HOURLY_PREFIX),
+        ("daily", settings.DAILY_VARIABLES, settings.SILVER_DAILY_PREFIX)
+    ]:
+        keys = dedup_index.unseen_blocks(
+            index, forecast_block_keys(envelopes, section, location_ids, excluded)
+        )
+
+        forecast_df = explode_forecast_arrays(
+            [envelopes[i] for i in keys["envelope"]], section, variables
+        )
+
+        if not forecast_df.empty:
+
+            forecast_files = write_partitioned(
+                forecast_df,
+                prefix=prefix,
+                time_column="forecast_time",
+                schema=FORECAST_SCHEMA
+            )
+
+            print(f"{section} rows: {len(forecast_df)} in {len(forecast_files)} files -> {prefix}")
+
+        dedup_index.record_blocks(index, keys)
+
+    index.close()
+
+
+def transform_envelopes(envelopes):
+
+    """
+    Flatten -> dedup -> typed, partitioned Silver write for one
+    batch of envelopes, plus the hourly / daily forecast datasets.
+    """
+
+    raw = normalize_envelopes(envelopes) if envelopes else pd.DataFrame()
+    valid = write_observations(raw)
+
+    # Envelopes whose observation was quarantined
+    excluded = set(raw["envelope"]) if not raw.empty else set()
+
+    if not valid.empty:
+        excluded -= set(valid["envelope"])
+
+    write_forecasts(envelopes, excluded)
+
+
 def run_transformation():
 
     print("\n===== TRANSFORMATION STARTED =====")
 
-    record = read_json_file()
+    storage = get_backend()
+
+    # Only Bronze objects not yet recorded in the manifest
+    # (plus earlier read failures)
+    manifest = load_manifest(storage)
+    pending = {obj["key"]: obj for obj in list_pending_objects(storage, manifest)}
 
-    if not record:
+    print(f"New raw files: {len(pending)}")
+
+    if not pending:
         print("No data found for transformation")
         return
 
-    # Convert to dataframe
-    df = pd.DataFrame([record])
+    # Batch mode: all pending envelopes fetched in parallel,
+    # then flattened together
+    envelopes, succeeded_keys, failed = read_bronze_envelopes(list(pending), storage)
+    print(f"Envelopes read: {len(envelopes)} ({len(failed)} files failed)")
 
-    # Fix datatypes
-    df["ingestion_time"] = pd.to_datetime(df["ingestion_time"])
-    df["observation_time"] = pd.to_datetime(df["observation_time"])
+    transform_envelopes(envelopes)
 
-    # Upload to Silver
-    upload_to_s3(df)
+    # Checkpoint only after Silver write succeeded;
+    # failed files are retried by every run until read
+    mark_processed(manifest, succeeded_keys)
+    mark_failed(manifest, [{**pending[f["key"]], "error": f["error"]} for f in failed])
+    save_manifest(storage, manifest)
 
     print("===== TRANSFORMATION COMPLETED =====")
 
 
+# ============================================================
+# STREAMING MODE (BOUNDED MEMORY)
+# ============================================================
+
+def estimated_memory(obj):
+
+    expansion = (
+        COMPRESSED_EXPANSION
+        if obj["key"].endswith((".gz", ".zst"))
+        else PLAIN_EXPANSION
+    )
+
+    return obj["size"] * expansion
+
+
+def iter_envelope_batches(objects, storage, max_batch_bytes, max_batch_records):
+
+    """
+    Generator stage: yields (envelopes, keys, failed) batches
+    whose estimated in-memory size and record count stay under
+    the limits; failed lists the objects that could not be read
+    (with their error). Only one batch plus the bounded fetch
+    window is held at any time.
+    """
+
+    objects = {obj["key"]: obj for obj in objects}
+    estimates = {key: estimated_memory(obj) for key, obj in objects.items()}
+
+    # Keep the fetch window inside the budget as well
+    largest = max(estimates.values(), default=1)
+    fetch_workers = max(1, min(FETCH_MAX_WORKERS, max_batch_bytes // (2 * max(1, largest))))
+
+    batch = []
+    batch_keys = []
+    batch_failed = []
+    batch_bytes = 0
+
+    for key, envelopes, error in fetch_bronze_objects(
+        list(objects), storage, max_workers=fetch_workers
+    ):
+        if error is not None:
+            print(f"Failed to read {key}: {error}")
+            batch_failed.append({**objects[key], "error": error})
+            continue
+
+        if batch and (
+            batch_bytes + estimates[key] > max_batch_bytes
+            or len(batch) + len(envelopes) > max_batch_records
+        ):
+            yield batch, batch_keys, batch_failed
+            batch, batch_keys, batch_failed, batch_bytes = [], [], [], 0
+
+        batch.extend(envelopes)
+        batch_keys.append(key)
+        batch_bytes += estimates[key]
+
+    if batch or batch_failed:
+        yield batch, batch_keys, batch_failed
+
+
+def run_streaming_transformation(max_memory_bytes=None, batch_records=None):
+
+    """
+    Same stages as run_transformation, driven batch by batch
+    (parse -> flatten -> type -> partitioned write) so peak
+    memory is bounded by max_memory_bytes no matter how much
+    Bronze is pending. The manifest is checkpointed after every
+    batch, so an interrupted run resumes where it stopped.
+    """
+
+    print("\n===== STREAMING TRANSFORMATION STARTED =====")
+
+    max_memory_bytes = max_memory_bytes or settings.STREAM_MAX_MEMORY_BYTES
+    batch_records = batch_records or settings.STREAM_BATCH_RECORDS
+
+    storage = get_backend()
+
+    manifest = load_manifest(storage)
+    pending = list_pending_objects(storage, manifest)
+
+    print(f"New raw files: {len(pending)}")
+
+    # Half the budget for the batch being built, half for the
+    # frames derived from it while it is transformed
+    batches = iter_envelope_batches(
+        pending, storage, max_memory_bytes // 2, batch_records
+    )
+
+    for batch_number, (envelopes, keys, failed) in enumerate(batches, start=1):
+
+        print(f"Batch {batch_number}: {len(keys)} files, {len(envelopes)} envelopes")
+
+        if envelopes:
+            transform_envelopes(envelopes)
+
+        mark_processed(manifest, keys)
+        mark_failed(manifest, failed)
+        save_manifest(storage, manifest)
+
+    print("===== STREAMING TRANSFORMATION COMPLETED =====")
+
+
+# ============================================================
+# HISTORY (BACKFILL) MODE
+# ============================================================
+
+def run_history_transformation(max_memory_bytes=None, batch_records=None):
+
+    """
+    Turns backfilled history chunks into Silver observations,
+    in bounded batches like the streaming mode. Only the pending
+    markers left by run_backfill are listed, never the history
+    prefix itself. Each marker is rewritten with the chunks still
+    pending after every batch and deleted once empty; the dedup
+    index keeps reruns from rewriting rows.
+    """
+
+    print("\n===== HISTORY TRANSFORMATION STARTED =====")
+
+    max_memory_bytes = max_memory_bytes or settings.STREAM_MAX_MEMORY_BYTES
+    batch_records = batch_records or settings.STREAM_BATCH_RECORDS
+
+    storage = get_backend()
+
+    markers = list_history_markers(storage)
+
+    print(f"Pending backfill runs: {len(markers)}")
+
+    for marker_key in markers:
+
+        pending = {obj["key"]: obj for obj in read_history_marker(storage, marker_key)}
+
+        print(f"{marker_key}: {len(pending)} history files")
+
+        batches = iter_envelope_batches(
+            list(pending.values()), storage, max_memory_bytes // 2, batch_records
+        )
+
+        for batch_number, (envelopes, keys, failed) in enumerate(batches, start=1):
+
+            print(f"Batch {batch_number}: {len(keys)} history files")
+
+            if envelopes:
+                write_observations(history_observations(envelopes))
+
+            # Chunks deleted from Bronze can never be read: drop them
+            done = keys + [
+                obj["key"]
+                for obj in failed
+                if not storage.exists(settings.RAW_BUCKET, obj["key"])
+            ]
+
+            for key in done:
+                pending.pop(key, None)
+
+            save_history_marker(storage, marker_key, list(pending.values()))
+
+    print("===== HISTORY TRANSFORMATION COMPLETED =====")
+
+
 # ============================================================
 # SCRIPT ENTRY POINT (Standalone Execution)
 # ============================================================
 
 if __name__ == "__main__":
-    run_transformation()
+
+    if "--history" in sys.argv:
+        run_history_transformation()
+    elif "--stream" in sys.argv:
+        run_streaming_transformation()
+    else:
+        run_transformation()
@@ -0,0 +1,129 @@
+# ============================================================
+# IMPORTS
+# ============================================================
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from Transformation.silver_schema import DICTIONARY_STRING, UTC_TIMESTAMP
+
+
+"""
+Silver Data-Quality Validation
+
+Column-wise checks over a whole batch in one vectorized pass:
+
+- null checks      -> required field missing
+- type checks      -> value present but did not parse
+- range checks     -> physically implausible measurement
+- domain checks    -> weathercode outside the WMO code table
+
+Each failing rule appends its reason code to the row, so a row
+can carry several reasons ("NULL_TEMPERATURE;RANGE_WINDSPEED").
+Failing rows go to the quarantine dataset with the raw values
+as text; passing rows continue to Silver.
+"""
+
+
+# ============================================================
+# RULES
+# ============================================================
+
+REQUIRED_COLUMNS = [
+    "run_id",
+    "observation_time",
+    "temperature",
+    "windspeed",
+    "winddirection",
+    "weathercode"
+]
+
+TYPED_COLUMNS = [
+    "ingestion_time",
+    "observation_time",
+    "temperature",
+    "windspeed",
+    "winddirection",
+    "weathercode"
+]
+
+# Inclusive bounds (Open-Meteo units: degC, km/h, degrees)
+RANGES = {
+    "temperature": (-90.0, 60.0),
+    "windspeed": (0.0, 500.0),
+    "winddirection": (0.0, 360.0)
+}
+
+# WMO weather interpretation codes used by Open-Meteo
+WEATHERCODES = [
+    0, 1, 2, 3, 45, 48,
+    51, 53, 55, 56, 57,
+    61, 63, 65, 66, 67,
+    71, 73, 75, 77,
+    80, 81, 82, 85, 86,
+    95, 96, 99
+]
+
+QUARANTINE_COLUMNS = [
+    "run_id",
+    "location_id",
+    "ingestion_time",
+    "observation_time",
+    "temperature",
+    "windspeed",
+    "winddirection",
+    "weathercode"
+]
+
+QUARANTINE_SCHEMA = pa.schema(
+    [pa.field("run_id", DICTIONARY_STRING), pa.field("location_id", DICTIONARY_STRING)]
+    + [pa.field(column, pa.string()) for column in QUARANTINE_COLUMNS[2:]]
+    + [pa.field("reason_codes", pa.string()), pa.field("quarantined_at", UTC_TIMESTAMP)]
+)
+
+
+# ============================================================
+# VALIDATE
+# ============================================================
+
+def validate_batch(df, raw):
+
+    """
+    Returns (valid_rows, quarantined_rows). df is the typed
+    batch, raw the same rows before typing (for type checks
+    and for the quarantine copy).
+    """
+
+    reasons = pd.Series("", index=df.index, dtype="object")
+
+    def flag(mask, code):
+        nonlocal reasons
+        reasons = reasons.where(~np.asarray(mask), reasons + code + ";")
+
+    raw_present = raw.notna()
+
+    for column in REQUIRED_COLUMNS:
+        flag(~raw_present[column], f"NULL_{column.upper()}")
+
+    for column in TYPED_COLUMNS:
+        flag(raw_present[column] & df[column].isna(), f"TYPE_{column.upper()}")
+
+    for column, (low, high) in RANGES.items():
+        values = df[column]
+        flag(values.notna() & ((values < low) | (values > high)), f"RANGE_{column.upper()}")
+
+    codes = df["weathercode"]
+    flag(codes.notna() & ~codes.isin(WEATHERCODES), "DOMAIN_WEATHERCODE")
+
+    bad = (reasons != "").to_numpy()
+
+    quarantined = raw.loc[bad, QUARANTINE_COLUMNS].copy()
+
+    for column in QUARANTINE_COLUMNS[2:]:
+        quarantined[column] = quarantined[column].astype("string")
+
+    quarantined["reason_codes"] = reasons[bad].str.rstrip(";")
+    quarantined["quarantined_at"] = pd.Timestamp.now(tz="UTC")
+
+    return df[~bad].reset_index(drop=True), quarantined.reset_index(drop=True)
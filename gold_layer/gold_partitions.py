@@ -0,0 +1,113 @@
+# ============================================================
+# IMPORTS
+# ============================================================
+
+import pandas as pd
+from sqlalchemy import text
+
+
+"""
+Gold Monthly Partitions
+
+weather_observations is range-partitioned by month on
+observation_time (see Postgre_Scripts/structure_script.sql).
+
+- partitions are created on demand for the months a load touches
+- retention drops whole partitions (no DELETE, no vacuum debt)
+- range queries on observation_time are pruned by PostgreSQL to
+  the partitions they cover
+"""
+
+
+# ============================================================
+# NAMING
+# ============================================================
+
+GOLD_TABLE = "weather_observations"
+
+
+def partition_name(month):
+
+    """month: pandas Period('YYYY-MM') -> weather_observations_YYYY_MM"""
+
+    return f"{GOLD_TABLE}_{month.year:04d}_{month.month:02d}"
+
+
+def partition_months(df, time_column="observation_time"):
+
+    return sorted(df[time_column].dt.to_period("M").unique())
+
+
+# ============================================================
+# CREATE
+# ============================================================
+
+def ensure_monthly_partitions(connection, months):
+
+    """Creates the monthly partitions that do not exist yet."""
+
+    for month in months:
+        start = month.start_time
+        end = (month + 1).start_time
+
+        connection.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {partition_name(month)} "
+            f"PARTITION OF {GOLD_TABLE} "
+            f"FOR VALUES FROM ('{start:%Y-%m-%d}') TO ('{end:%Y-%m-%d}')"
+        ))
+
+    return [partition_name(month) for month in months]
+
+
+# ============================================================
+# RETENTION
+# ============================================================
+
+def list_partitions(connection):
+
+    """Returns {partition_name: Period} for existing monthly partitions."""
+
+    rows = connection.execute(text("""
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE parent.relname = :table
+    """), {"table": GOLD_TABLE})
+
+    partitions = {}
+
+    for (name,) in rows:
+        suffix = name[len(GOLD_TABLE) + 1:]
+
+        try:
+            partitions[name] = pd.Period(suffix.replace("_", "-"), freq="M")
+        except ValueError:
+            continue
+
+    return partitions
+
+
+def drop_expired_partitions(connection, retention_months, now=None):
+
+    """
+    Drops partitions whose whole month lies before the retention
+    window (retention_months full months back from now).
+    """
+
+    if not retention_months:
+        return []
+
+    now = now or pd.Timestamp.now(tz="UTC")
+    oldest_kept = now.tz_localize(None).to_period("M") - retention_months
+
+    dropped = [
+        name
+        for name, month in sorted(list_partitions(connection).items())
+        if month < oldest_kept
+    ]
+
+    for name in dropped:
+        connection.execute(text(f"DROP TABLE {name}"))
+
+    return dropped
@@ -0,0 +1,149 @@
+# ============================================================
+# IMPORTS
+# ============================================================
+
+import os
+import sys
+from sqlalchemy import create_engine, text
+
+# --------------------------------------------------
+# FIX IMPORT PATH (standalone execution)
+# --------------------------------------------------
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from config import settings
+
+
+"""
+Gold Rollups (Incremental Hourly / Daily Aggregates)
+
+Keeps weather_rollup_hourly and weather_rollup_daily in step with
+weather_observations. Each Gold partition load calls
+refresh_rollups in its own transaction, right after the upsert:
+
+1. the staged rows name the (location, hour/day) buckets touched
+2. those buckets are recomputed from the Gold partition itself
+   (count / sum / min / max per measure), using the
+   (location_id, observation_time) key for the range lookups
+3. one INSERT ... ON CONFLICT DO UPDATE per table replaces the
+   aggregate rows
+
+Recomputing instead of adding deltas keeps the aggregates right
+when rows are updated (revisions) or reloaded, and sharing the
+load transaction means a failure rolls back rows and aggregates
+together. Means are derived columns (sum / count) in the tables.
+"""
+
+
+# ============================================================
+# ROLLUP CONFIG
+# ============================================================
+
+# date_trunc unit -> rollup table
+ROLLUP_TABLES = {
+    "hour": "weather_rollup_hourly",
+    "day": "weather_rollup_daily"
+}
+
+MEASURES = ["temperature", "windspeed"]
+
+STATS = {
+    "count": "COUNT",
+    "sum": "SUM",
+    "min": "MIN",
+    "max": "MAX"
+}
+
+
+# ============================================================
+# RECOMPUTE TOUCHED BUCKETS
+# ============================================================
+
+def refresh_sql(table, unit, source_table, touched_table):
+
+    """
+    Recomputes the buckets of table that contain a row of
+    touched_table, from all rows of source_table in them.
+    """
+
+    columns = [f"{measure}_{stat}" for measure in MEASURES for stat in STATS]
+
+    aggregates = [
+        f"{function}(o.{measure}) AS {measure}_{stat}"
+        for measure in MEASURES
+        for stat, function in STATS.items()
+    ]
+
+    updates = [f"{column} = EXCLUDED.{column}" for column in columns]
+
+    return f"""
+    INSERT INTO {table} (location_id, bucket_start, {", ".join(columns)})
+    SELECT o.location_id, t.bucket_start, {", ".join(aggregates)}
+    FROM (
+        SELECT DISTINCT location_id, date_trunc('{unit}', observation_time) AS bucket_start
+        FROM {touched_table}
+    ) t
+    JOIN {source_table} o
+      ON o.location_id = t.location_id
+     AND o.observation_time >= t.bucket_start
+     AND o.observation_time < t.bucket_start + INTERVAL '1 {unit}'
+    GROUP BY o.location_id, t.bucket_start
+    ON CONFLICT (location_id, bucket_start) DO UPDATE SET
+        {", ".join(updates)};
+    """
+
+
+def refresh_rollups(connection, source_table, touched_table):
+
+    """
+    Runs inside the caller's transaction. source_table is the
+    Gold table or partition holding the touched rows; hour and
+    day buckets never cross a monthly partition boundary.
+    """
+
+    refreshed = {}
+
+    for unit, table in ROLLUP_TABLES.items():
+        result = connection.execute(text(
+            refresh_sql(table, unit, source_table, touched_table)
+        ))
+        refreshed[table] = result.rowcount
+
+    return refreshed
+
+
+# ============================================================
+# FULL REBUILD (STANDALONE)
+# ============================================================
+
+def rebuild_rollups(engine=None):
+
+    """Recomputes every bucket from weather_observations."""
+
+    print("\n===== GOLD ROLLUP REBUILD STARTED =====")
+
+    own_engine = engine is None
+    engine = engine or create_engine(settings.POSTGRES_URL)
+
+    with engine.begin() as connection:
+        refreshed = refresh_rollups(
+            connection, "weather_observations", "weather_observations"
+        )
+
+    for table, buckets in refreshed.items():
+        print(f"{table}: {buckets} buckets rebuilt")
+
+    if own_engine:
+        engine.dispose()
+
+    print("===== GOLD ROLLUP REBUILD COMPLETED =====")
+
+
+# ============================================================
+# ENTRY POINT (Standalone Run)
+# ============================================================
+
+if __name__ == "__main__":
+    rebuild_rollups()
@@ -0,0 +1,122 @@
+# ============================================================
+# IMPORTS
+# ============================================================
+
+import pandas as pd
+from sqlalchemy import text
+
+from Transformation.silver_manifest import live_objects
+
+
+"""
+Silver Load Ledger
+
+Records in PostgreSQL which Silver parquet files the Gold
+loader has already loaded (path, size, etag, row count).
+Each run diffs the current Silver listing against it and
+reads only files that are new or were rewritten (new etag),
+so late and backfilled rows are picked up regardless of the
+observation_time watermark.
+
+- ledger rows are written only after every Gold partition
+  load committed, so a file is marked loaded only if its rows are
+- the listing is resolved through the partition manifests, so
+  files superseded by compaction drop out of it and are
+  pruned, keeping the ledger the size of the live listing
+- compacted outputs look like new files; the Gold merge
+  (ON CONFLICT) makes reloading their rows idempotent
+"""
+
+
+# ============================================================
+# LEDGER TABLE
+# ============================================================
+
+LEDGER_TABLE = "silver_load_ledger"
+
+CREATE_LEDGER_SQL = f"""
+CREATE TABLE IF NOT EXISTS {LEDGER_TABLE} (
+    path TEXT PRIMARY KEY,
+    size BIGINT NOT NULL,
+    etag TEXT NOT NULL,
+    row_count BIGINT NOT NULL,
+    loaded_at TIMESTAMP NOT NULL DEFAULT (now() AT TIME ZONE 'utc')
+)
+"""
+
+RECORD_SQL = f"""
+INSERT INTO {LEDGER_TABLE} (path, size, etag, row_count)
+VALUES (:path, :size, :etag, :row_count)
+ON CONFLICT (path) DO UPDATE SET
+    size = EXCLUDED.size,
+    etag = EXCLUDED.etag,
+    row_count = EXCLUDED.row_count,
+    loaded_at = now() AT TIME ZONE 'utc'
+"""
+
+
+def ensure_ledger(connection):
+
+    connection.execute(text(CREATE_LEDGER_SQL))
+
+
+def load_ledger(connection):
+
+    """Returns {path: etag} for every file already loaded."""
+
+    rows = connection.execute(text(f"SELECT path, etag FROM {LEDGER_TABLE}"))
+
+    return dict(rows.fetchall())
+
+
+# ============================================================
+# LISTING DIFF
+# ============================================================
+
+def list_silver_files(storage, bucket, prefix):
+
+    """Live Silver parquet objects (see silver_manifest.py)."""
+
+    return live_objects(storage, bucket, storage.list_objects(bucket, prefix.rstrip("/") + "/"))
+
+
+def pending_files(listing, ledger):
+
+    """Files not in the ledger, or whose etag changed since."""
+
+    return [obj for obj in listing if ledger.get(obj["key"]) != obj["etag"]]
+
+
+# ============================================================
+# RECORD
+# ============================================================
+
+def record_loaded(connection, files, row_counts, listing):
+
+    """
+    Marks files as loaded (row_counts: {key: rows}) and drops
+    ledger entries for paths no longer in the Silver listing.
+    """
+
+    if files:
+        connection.execute(text(RECORD_SQL), [
+            {
+                "path": obj["key"],
+                "size": obj["size"],
+                "etag": obj["etag"],
+                "row_count": row_counts.get(obj["key"], 0)
+            }
+            for obj in files
+        ])
+
+    listed = pd.Index([obj["key"] for obj in listing])
+    ledger = pd.Index(list(load_ledger(connection)))
+    vanished = ledger.difference(listed).tolist()
+
+    if vanished:
+        connection.execute(
+            text(f"DELETE FROM {LEDGER_TABLE} WHERE path = ANY(:paths)"),
+            {"paths": vanished}
+        )
+
+    return len(vanished)
@@ -38,7 +38,7 @@ import os
 # IMPORT PIPELINE STEPS
 # ------------------------------------------------------------
 from Ingestion.Ingestion import run_ingestion
-from Transformation.transformation import run_transformation
+from Transformation.transformation import run_transformation, run_history_transformation
 from gold_layer.load_to_postgre import run_gold_load
 
 
@@ -82,9 +82,14 @@ def run_pipeline():
         logging.info("Running Transformation Layer")
         run_transformation()
 
+        # Backfilled history chunks (no-op when none are pending)
+        run_history_transformation()
+
         # -------------------------
         # STEP 3 — GOLD LOAD
         # -------------------------
+        # (hourly / daily rollups are refreshed inside each
+        # partition's load transaction)
         logging.info("Running Gold Layer")
         run_gold_load()
 
@@ -0,0 +1,295 @@
+# ============================================================
+# IMPORTS
+# ============================================================
+
+import os
+import shutil
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+
+from config import settings
+
+
+"""
+Storage Backends
+
+One interface for the Bronze and Silver stores so every stage
+can run against S3 or a local directory:
+
+- S3Backend     -> shared boto3 client / s3fs filesystem
+- LocalBackend  -> <root>/<bucket>/<key> on disk, with
+                   memory-mapped Parquet reads
+
+Pick the backend with settings.STORAGE_BACKEND ("s3" | "local").
+"""
+
+
+# ============================================================
+# BACKEND CONFIG
+# ============================================================
+
+MULTIPART_THRESHOLD = 16 * 1024 * 1024
+MULTIPART_CHUNKSIZE = 16 * 1024 * 1024
+
+# head_object error codes that mean the key is absent
+MISSING_OBJECT_CODES = {"404", "NoSuchKey", "NotFound"}
+
+
+# ============================================================
+# INTERFACE
+# ============================================================
+
+class StorageBackend(ABC):
+
+    @abstractmethod
+    def put_bytes(self, bucket, key, data, content_type=None):
+        pass
+
+    @abstractmethod
+    def upload_fileobj(self, fileobj, bucket, key, content_type=None):
+        pass
+
+    @abstractmethod
+    def get_bytes(self, bucket, key):
+        pass
+
+    @abstractmethod
+    def open_stream(self, bucket, key):
+        """Returns a readable binary stream; caller closes it."""
+
+    @abstractmethod
+    def exists(self, bucket, key):
+        """False only when the object is missing; other errors raise."""
+
+    @abstractmethod
+    def delete(self, bucket, key):
+        pass
+
+    @abstractmethod
+    def list_objects(self, bucket, prefix=""):
+        """Yields {"key", "size", "etag"} for every object under prefix."""
+
+    @abstractmethod
+    def dataset_location(self, bucket, prefix):
+        """Returns (pyarrow-compatible filesystem, path) for ds.dataset()."""
+
+    @abstractmethod
+    def open_parquet(self, bucket, key):
+        """Returns a pyarrow.parquet.ParquetFile for one object."""
+
+
+# ============================================================
+# S3 BACKEND
+# ============================================================
+
+class S3Backend(StorageBackend):
+
+    def __init__(self, client=None):
+
+        # Imported here so the local backend works without boto3
+        from boto3.s3.transfer import TransferConfig
+        from storage.clients import get_s3_client, get_s3_filesystem
+
+        self.client = client or get_s3_client()
+        self.get_filesystem = get_s3_filesystem
+        self.transfer_config = TransferConfig(
+            multipart_threshold=MULTIPART_THRESHOLD,
+            multipart_chunksize=MULTIPART_CHUNKSIZE
+        )
+
+    def put_bytes(self, bucket, key, data, content_type=None):
+
+        extra = {"ContentType": content_type} if content_type else {}
+        self.client.put_object(Bucket=bucket, Key=key, Body=data, **extra)
+
+    def upload_fileobj(self, fileobj, bucket, key, content_type=None):
+
+        # Switches to multipart upload above the threshold
+        self.client.upload_fileobj(
+            fileobj,
+            bucket,
+            key,
+            ExtraArgs={"ContentType": content_type} if content_type else None,
+            Config=self.transfer_config
+        )
+
+    def get_bytes(self, bucket, key):
+
+        return self.client.get_object(Bucket=bucket, Key=key)["Body"].read()
+
+    def open_stream(self, bucket, key):
+
+        return self.client.get_object(Bucket=bucket, Key=key)["Body"]
+
+    def exists(self, bucket, key):
+
+        try:
+            self.client.head_object(Bucket=bucket, Key=key)
+            return True
+
+        except self.client.exceptions.ClientError as e:
+            # Only a missing object is "does not exist"; denied
+            # access, throttling etc. must not read as missing
+            if e.response.get("Error", {}).get("Code") in MISSING_OBJECT_CODES:
+                return False
+            raise
+
+    def delete(self, bucket, key):
+
+        self.client.delete_object(Bucket=bucket, Key=key)
+
+    def list_objects(self, bucket, prefix=""):
+
+        paginator = self.client.get_paginator("list_objects_v2")
+
+        for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+            for obj in page.get("Contents", []):
+                yield {
+                    "key": obj["Key"],
+                    "size": obj["Size"],
+                    "etag": obj["ETag"].strip('"')
+                }
+
+    def dataset_location(self, bucket, prefix):
+
+        return self.get_filesystem(), f"{bucket}/{prefix.rstrip('/')}/"
+
+    def open_parquet(self, bucket, key):
+
+        import pyarrow.parquet as pq
+
+        return pq.ParquetFile(self.get_filesystem().open(f"{bucket}/{key}", "rb"))
+
+
+# ============================================================
+# LOCAL DIRECTORY BACKEND
+# ============================================================
+
+class LocalBackend(StorageBackend):
+
+    def __init__(self, root=None):
+
+        self.root = os.path.abspath(root or settings.LOCAL_STORAGE_ROOT)
+
+    def _path(self, bucket, key):
+
+        return os.path.join(self.root, bucket, *key.split("/"))
+
+    def _key(self, bucket, path):
+
+        return os.path.relpath(path, os.path.join(self.root, bucket)).replace(os.sep, "/")
+
+    def _atomic_write(self, path, write):
+
+        # Write to a temp file in the same directory, then rename,
+        # so readers never see a partially written object
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            os.replace(tmp_path, path)
+
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def put_bytes(self, bucket, key, data, content_type=None):
+
+        self._atomic_write(self._path(bucket, key), lambda f: f.write(data))
+
+    def upload_fileobj(self, fileobj, bucket, key, content_type=None):
+
+        self._atomic_write(
+            self._path(bucket, key),
+            lambda f: shutil.copyfileobj(fileobj, f)
+        )
+
+    def get_bytes(self, bucket, key):
+
+        with open(self._path(bucket, key), "rb") as f:
+            return f.read()
+
+    def open_stream(self, bucket, key):
+
+        return open(self._path(bucket, key), "rb")
+
+    def exists(self, bucket, key):
+
+        return os.path.isfile(self._path(bucket, key))
+
+    def delete(self, bucket, key):
+
+        path = self._path(bucket, key)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def list_objects(self, bucket, prefix=""):
+
+        bucket_root = os.path.join(self.root, bucket)
+
+        # Walk only the deepest directory covered by the prefix
+        prefix_dir = prefix.rsplit("/", 1)[0] if "/" in prefix else ""
+        start = os.path.join(bucket_root, *prefix_dir.split("/")) if prefix_dir else bucket_root
+
+        for dirpath, dirnames, filenames in os.walk(start):
+            dirnames.sort()
+
+            for name in sorted(filenames):
+                if name.startswith(".tmp-"):
+                    continue
+
+                path = os.path.join(dirpath, name)
+                key = self._key(bucket, path)
+
+                if not key.startswith(prefix):
+                    continue
+
+                stat = os.stat(path)
+                yield {
+                    "key": key,
+                    "size": stat.st_size,
+                    "etag": f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+                }
+
+    def dataset_location(self, bucket, prefix):
+
+        from pyarrow import fs
+
+        return fs.LocalFileSystem(use_mmap=True), self._path(bucket, prefix.rstrip("/"))
+
+    def open_parquet(self, bucket, key):
+
+        import pyarrow.parquet as pq
+
+        return pq.ParquetFile(self._path(bucket, key), memory_map=True)
+
+
+# ============================================================
+# BACKEND SELECTION
+# ============================================================
+
+_lock = threading.Lock()
+_backend = None
+
+
+def get_backend():
+
+    global _backend
+
+    if _backend is None:
+        with _lock:
+            if _backend is None:
+                if settings.STORAGE_BACKEND == "local":
+                    _backend = LocalBackend()
+                elif settings.STORAGE_BACKEND == "s3":
+                    _backend = S3Backend()
+                else:
+                    raise ValueError(
+                        f"Unknown STORAGE_BACKEND: {settings.STORAGE_BACKEND}"
+                    )
+
+    return _backend
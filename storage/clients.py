@@ -0,0 +1,89 @@
+# ============================================================
+# IMPORTS
+# ============================================================
+
+import threading
+
+import boto3
+from botocore.config import Config
+
+from config import settings
+
+
+"""
+Shared Storage Clients
+
+One S3 client and one s3fs filesystem per process, built with
+tuned connection pool, retry and timeout settings and reused
+by every stage. boto3 clients are thread-safe once created,
+so worker pools share them as well.
+"""
+
+
+# ============================================================
+# CLIENT CACHE
+# ============================================================
+
+_lock = threading.Lock()
+_s3_client = None
+_s3_filesystem = None
+
+
+def client_config():
+
+    return Config(
+        max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+        connect_timeout=settings.S3_CONNECT_TIMEOUT,
+        read_timeout=settings.S3_READ_TIMEOUT,
+        retries={
+            "max_attempts": settings.S3_MAX_ATTEMPTS,
+            "mode": settings.S3_RETRY_MODE
+        }
+    )
+
+
+# ============================================================
+# S3 CLIENT (boto3)
+# ============================================================
+
+def get_s3_client():
+
+    global _s3_client
+
+    if _s3_client is None:
+        with _lock:
+            if _s3_client is None:
+                # A dedicated session: the default boto3 session
+                # is not safe to build clients from concurrently
+                session = boto3.session.Session()
+                _s3_client = session.client("s3", config=client_config())
+
+    return _s3_client
+
+
+# ============================================================
+# S3 FILESYSTEM (s3fs, used by pyarrow datasets)
+# ============================================================
+
+def get_s3_filesystem():
+
+    global _s3_filesystem
+
+    if _s3_filesystem is None:
+        with _lock:
+            if _s3_filesystem is None:
+                import s3fs
+
+                _s3_filesystem = s3fs.S3FileSystem(
+                    config_kwargs={
+                        "max_pool_connections": settings.S3_MAX_POOL_CONNECTIONS,
+                        "connect_timeout": settings.S3_CONNECT_TIMEOUT,
+                        "read_timeout": settings.S3_READ_TIMEOUT,
+                        "retries": {
+                            "max_attempts": settings.S3_MAX_ATTEMPTS,
+                            "mode": settings.S3_RETRY_MODE
+                        }
+                    }
+                )
+
+    return _s3_filesystem
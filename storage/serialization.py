@@ -0,0 +1,115 @@
+# ============================================================
+# IMPORTS
+# ============================================================
+
+import io
+import gzip
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+"""
+Bronze Serialization
+
+Fast JSON encode/decode shared by ingestion and transformation.
+Uses orjson when it is installed and falls back to the stdlib
+json module otherwise. Decoding works straight from bytes or a
+binary stream, so raw bytes are never copied into a decoded str
+before parsing.
+"""
+
+
+# ============================================================
+# JSON
+# ============================================================
+
+def dumps(obj):
+
+    """Serializes obj to UTF-8 JSON bytes."""
+
+    if orjson is not None:
+        return orjson.dumps(obj)
+
+    return json.dumps(obj).encode("utf-8")
+
+
+def loads(data):
+
+    """Parses JSON from bytes, bytearray, memoryview or str."""
+
+    if orjson is not None:
+        return orjson.loads(data)
+
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+
+    # stdlib json.loads detects the encoding of bytes input
+    return json.loads(data)
+
+
+def load_stream(stream):
+
+    """Parses one JSON document from a binary stream."""
+
+    if orjson is not None:
+        return orjson.loads(stream.read())
+
+    return json.load(stream)
+
+
+# ============================================================
+# NDJSON
+# ============================================================
+
+def iter_ndjson(stream):
+
+    """Yields one parsed object per non-empty line of a binary stream."""
+
+    # botocore StreamingBody iterates in fixed-size chunks, not lines
+    lines = stream.iter_lines() if hasattr(stream, "iter_lines") else stream
+
+    for line in lines:
+        if line.strip():
+            yield loads(line)
+
+
+def decompressed_stream(key, stream):
+
+    """Wraps a binary stream with the decompressor matching the key suffix."""
+
+    if key.endswith(".gz"):
+        return gzip.GzipFile(fileobj=stream)
+
+    if key.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError(f"zstandard is required to read {key}")
+
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(stream))
+
+    return stream
+
+
+def iter_envelopes(key, stream):
+
+    """
+    Yields the enriched envelopes stored in one Bronze object.
+
+    - *.json              -> one envelope (single-run writes)
+    - *.ndjson.gz / .zst  -> one envelope per line (batch writes)
+    """
+
+    stream = decompressed_stream(key, stream)
+
+    if ".ndjson" in key:
+        yield from iter_ndjson(stream)
+    else:
+        yield load_stream(stream)